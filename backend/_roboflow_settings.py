@@ -0,0 +1,63 @@
+"""
+Shared Roboflow settings for the test scripts
+API endpoint, test image encoding and the on-disk result cache
+"""
+import base64
+import hashlib
+import orjson
+import os
+import pathlib
+import random
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Roboflow hosted inference
+API_URL = "https://detect.roboflow.com"
+API_KEY = os.getenv("ROBOFLOW_API_KEY")
+if not API_KEY:
+    raise RuntimeError("ROBOFLOW_API_KEY is not set; add it to backend/.env (run setup_env.py)")
+
+# Roboflow's raw base64 upload
+UPLOAD_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# Transient failures (rate limiting, gateway errors) retried with jittered exponential backoff
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 5
+BACKOFF_FACTOR = 0.3
+
+# On-disk result cache keyed by (image hash, model); set ROBOFLOW_NO_CACHE=1 to bypass
+CACHE_DIR = pathlib.Path(".infer_cache")
+USE_CACHE = not os.getenv("ROBOFLOW_NO_CACHE")
+
+def load_image(path="test.jpg"):
+    """Read an image once, returning (base64 body, sha256 hex digest)"""
+    with open(path, "rb") as f:
+        image_bytes = f.read()
+    return base64.b64encode(image_bytes), hashlib.sha256(image_bytes).hexdigest()
+
+def cache_path(image_hash, model_id):
+    """Cache file for a model's result on an image"""
+    return CACHE_DIR / f"{image_hash}_{model_id.replace('/', '_')}.json"
+
+def load_cached(image_hash, model_id):
+    """Cached result, or None on a miss"""
+    path = cache_path(image_hash, model_id)
+    if not USE_CACHE or not path.exists():
+        return None
+    return orjson.loads(path.read_bytes())
+
+def save_cached(image_hash, model_id, result):
+    """Store a result for the next run"""
+    if USE_CACHE:
+        CACHE_DIR.mkdir(exist_ok=True)
+        cache_path(image_hash, model_id).write_bytes(orjson.dumps(result))
+
+def backoff_delay(attempt, retry_after=None):
+    """Seconds to wait before retry number attempt (from 0): Retry-After if the server sent one, else full jitter"""
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass  # HTTP-date form; fall back to backoff
+    return random.uniform(0, BACKOFF_FACTOR * 2 ** attempt)
@@ -92,16 +92,32 @@ class AccurateSignDetector:
         """
         start_time = time.time()
         
-        try:
-            # Step 1: Convert bytes to OpenCV image
-            image = self._bytes_to_cv2(image_bytes)
-            if image is None:
-                return {
-                    'success': False,
-                    'error': 'Failed to decode image',
-                    'processing_time': time.time() - start_time
-                }
+        # Step 1: Convert bytes to OpenCV image
+        image = self._bytes_to_cv2(image_bytes)
+        if image is None:
+            return {
+                'success': False,
+                'error': 'Failed to decode image',
+                'processing_time': time.time() - start_time
+            }
+        
+        return self.detect_signs_in_image(image, start_time=start_time)
+    
+    def detect_signs_in_image(self, image: np.ndarray, start_time: Optional[float] = None) -> Dict:
+        """
+        Detect sign language in an already decoded image
+        
+        Args:
+            image: BGR image from OpenCV
+            start_time: When processing started (defaults to now)
             
+        Returns:
+            Detection result with hands and signs
+        """
+        if start_time is None:
+            start_time = time.time()
+        
+        try:
             # Step 2: Detect hands with MediaPipe
             hand_detections = self.hand_detector.detect_hands(image)
             
@@ -0,0 +1,119 @@
+"""
+Async LRU cache for SmartSign
+Memoizes coroutine results; concurrent misses on the same key share one call
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncLRUCache:
+    """
+    Least-recently-used cache of awaitable results
+
+    Each entry stores an asyncio.Future, so a request arriving while the first
+    call for the same key is still running awaits that call instead of
+    starting its own. Failed calls are evicted so they can be retried.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl  # Seconds before an entry expires (None = never)
+
+        self._entries: "OrderedDict[Hashable, Tuple[asyncio.Future, float]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    async def get_or_set(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        cacheable: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """
+        Return the cached result for key, or await factory() and cache it
+
+        Args:
+            key: Hashable cache key
+            factory: Zero-argument callable returning the awaitable to run on a miss
+            cacheable: Predicate on the result; results it rejects (e.g. degraded
+                fallbacks) are still shared with concurrent waiters but not kept
+
+        Returns:
+            The cached or freshly computed result
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            future, created_at = entry
+            if self.ttl is None or time.monotonic() - created_at < self.ttl:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return await asyncio.shield(future)
+            del self._entries[key]
+
+        self._misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._entries[key] = (future, time.monotonic())
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+        try:
+            result = await factory()
+        except BaseException as e:
+            # Don't cache failures - the next caller should retry
+            if self._entries.get(key, (None,))[0] is future:
+                del self._entries[key]
+            if isinstance(e, asyncio.CancelledError):
+                # Waiters shouldn't be cancelled just because the first caller was
+                e = RuntimeError("Cached call was cancelled")
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+
+        if cacheable is not None and not cacheable(result):
+            if self._entries.get(key, (None,))[0] is future:
+                del self._entries[key]
+
+        future.set_result(result)
+        return result
+
+    def set(self, key: Hashable, value: Any):
+        """Store an already computed value (e.g. from a bulk pre-computation)"""
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._entries[key] = (future, time.monotonic())
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Drop every entry whose key matches predicate
+
+        Returns:
+            Number of entries removed
+        """
+        stale = [key for key in self._entries if predicate(key)]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def clear(self):
+        """Drop all entries"""
+        self._entries.clear()
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+        }
@@ -4,11 +4,12 @@ Uses GPT-4o-mini with RAG approach to generate context-aware narrative summaries
 """
 
 import logging
-import json
+import time
+import orjson
 import re
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence
 from datetime import datetime
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from models.visit_history import (
     VisitHistory,
@@ -25,15 +26,20 @@ class CaseBriefGenerator:
     Pulls context from visit history and inter-departmental logs to create narrative summaries.
     """
 
-    def __init__(self, openai_client: Optional[OpenAI] = None):
+    def __init__(self, openai_client: Optional[AsyncOpenAI] = None):
         self.client = openai_client
 
-    def _build_rag_context(
+    def build_rag_context(
         self,
-        visits: List[VisitHistory],
-        logs: List[DepartmentalLog]
+        visits: Sequence[VisitHistory],
+        logs: Sequence[DepartmentalLog]
     ) -> str:
-        """Build RAG context from multiple data sources"""
+        """
+        Build RAG context from multiple data sources
+
+        Depends only on the records, so callers with unchanging history can
+        build it once and pass it to generate_brief as rag_context.
+        """
         context_parts = []
 
         # Recent visit history context
@@ -41,7 +47,7 @@ class CaseBriefGenerator:
             context_parts.append("## Recent Visit History")
             for visit in visits[:5]:  # Limit to 5 most recent
                 context_parts.append(f"""
-- {visit.datetime}: Visited {visit.location}
+- {visit.datetime.isoformat()}: Visited {visit.location}
   Purpose: {visit.application}
   Status: {visit.status}
   Documents Requested: {', '.join(visit.documents_requested) if visit.documents_requested else 'None'}
@@ -84,10 +90,11 @@ class CaseBriefGenerator:
     async def generate_brief(
         self,
         user_id: str,
-        visits: List[VisitHistory],
-        logs: List[DepartmentalLog],
+        visits: Sequence[VisitHistory],
+        logs: Sequence[DepartmentalLog],
         current_location: Optional[str] = None,
         user_name: Optional[str] = None,
+        rag_context: Optional[str] = None,
     ) -> CaseBrief:
         """
         Generate an intelligent case brief for officers
@@ -98,11 +105,12 @@ class CaseBriefGenerator:
             logs: List of inter-departmental log entries
             current_location: Current service center
             user_name: User's name (for anonymization)
+            rag_context: Pre-built build_rag_context(visits, logs) output, if cached
 
         Returns:
             CaseBrief with narrative summary and actionable insights
         """
-        context = self._build_rag_context(visits, logs)
+        context = rag_context if rag_context is not None else self.build_rag_context(visits, logs)
 
         # Determine context sources used
         sources = []
@@ -144,14 +152,14 @@ Respond in JSON format:
 
 Only respond with valid JSON, nothing else."""
 
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 max_tokens=500,
                 response_format={"type": "json_object"},
                 messages=[{"role": "user", "content": prompt}]
             )
 
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
 
             # Anonymize the narrative
             narrative = self._anonymize_brief(
@@ -175,8 +183,8 @@ Only respond with valid JSON, nothing else."""
 
     def _fallback_brief(
         self,
-        visits: List[VisitHistory],
-        logs: List[DepartmentalLog],
+        visits: Sequence[VisitHistory],
+        logs: Sequence[DepartmentalLog],
         sources: List[str]
     ) -> CaseBrief:
         """Rule-based fallback when GPT is unavailable"""
@@ -190,7 +198,7 @@ Only respond with valid JSON, nothing else."""
             last_visit = visits[0]
 
             # Build narrative
-            days_ago = self._days_since(last_visit.datetime)
+            days_ago = self._days_since(last_visit.epoch)
             if days_ago == 0:
                 time_str = "earlier today"
             elif days_ago == 1:
@@ -198,7 +206,7 @@ Only respond with valid JSON, nothing else."""
             elif days_ago < 7:
                 time_str = f"{days_ago} days ago"
             else:
-                time_str = f"on {last_visit.datetime[:10]}"
+                time_str = f"on {last_visit.datetime:%Y-%m-%d}"
 
             narrative_parts.append(
                 f"This citizen visited {last_visit.location} {time_str} regarding {last_visit.application}."
@@ -247,15 +255,10 @@ Only respond with valid JSON, nothing else."""
             recommended_actions=recommended_actions[:3],
             context_sources=sources,
             generated_at=datetime.now().isoformat(),
-            privacy_verified=True
+            privacy_verified=True,
+            is_fallback=True
         )
 
-    def _days_since(self, datetime_str: str) -> int:
-        """Calculate days since a given datetime string"""
-        try:
-            visit_date = datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
-            if visit_date.tzinfo:
-                visit_date = visit_date.replace(tzinfo=None)
-            return (datetime.now() - visit_date).days
-        except:
-            return 7  # Default to a week ago if parsing fails
+    def _days_since(self, epoch: int) -> int:
+        """Calculate whole days since a visit's Unix timestamp"""
+        return int((time.time() - epoch) // 86400)
@@ -4,10 +4,10 @@ Uses GPT-4o-mini to generate context-aware BIM greetings based on visit history
 """
 
 import logging
-import json
-from typing import List, Optional
+import orjson
+from typing import Optional, Sequence
 from datetime import datetime
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from models.visit_history import (
     VisitHistory,
@@ -68,12 +68,12 @@ class GreetingGenerator:
         ],
     }
 
-    def __init__(self, openai_client: Optional[OpenAI] = None):
+    def __init__(self, openai_client: Optional[AsyncOpenAI] = None):
         self.client = openai_client
 
     def _determine_greeting_type(
         self,
-        visits: List[VisitHistory],
+        visits: Sequence[VisitHistory],
         prediction: Optional[PredictionResult] = None
     ) -> str:
         """Determine the appropriate greeting type based on context"""
@@ -107,7 +107,7 @@ class GreetingGenerator:
 
     def _format_context_for_greeting(
         self,
-        visits: List[VisitHistory],
+        visits: Sequence[VisitHistory],
         prediction: Optional[PredictionResult] = None
     ) -> str:
         """Format context for LLM greeting generation"""
@@ -119,7 +119,7 @@ class GreetingGenerator:
 
         if visits:
             last = visits[0]
-            parts.append(f"Last visit: {last.location} on {last.datetime[:10]}")
+            parts.append(f"Last visit: {last.location} on {last.datetime:%Y-%m-%d}")
             parts.append(f"Previous purpose: {last.application}")
 
             if last.follow_up_required:
@@ -136,7 +136,7 @@ class GreetingGenerator:
     async def generate_greeting(
         self,
         user_id: str,
-        visits: List[VisitHistory],
+        visits: Sequence[VisitHistory],
         prediction: Optional[PredictionResult] = None,
         current_location: Optional[str] = None,
     ) -> PersonalizedGreeting:
@@ -193,14 +193,14 @@ Respond in JSON format:
 
 Only respond with valid JSON, nothing else."""
 
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 max_tokens=100,
                 response_format={"type": "json_object"},
                 messages=[{"role": "user", "content": prompt}]
             )
 
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
 
             return PersonalizedGreeting(
                 greeting_text=result.get("greeting", self.GREETING_TYPES[greeting_type]),
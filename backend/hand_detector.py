@@ -6,6 +6,7 @@ Ensures we only detect actual hands, not random objects
 import cv2
 import mediapipe as mp
 import numpy as np
+import threading
 from typing import List, Dict, Optional, Tuple
 import logging
 
@@ -44,6 +45,9 @@ class HandDetector:
         )
         self.detector = vision.HandLandmarker.create_from_options(options)
 
+        # HandLandmarker isn't thread-safe; serialize calls when shared across worker threads
+        self._lock = threading.Lock()
+
         logger.info("✅ MediaPipe Hand Detector initialized (v0.10.x API)")
     
     def detect_hands(self, image: np.ndarray) -> List[Dict]:
@@ -63,7 +67,8 @@ class HandDetector:
         mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_image)
 
         # Process image
-        results = self.detector.detect(mp_image)
+        with self._lock:
+            results = self.detector.detect(mp_image)
 
         detections = []
 
@@ -8,6 +8,7 @@ import io
 import tempfile
 import os
 import hashlib
+import threading
 import time
 from typing import Dict, Optional, Tuple, List
 from PIL import Image
@@ -42,6 +43,9 @@ class HybridSignDetector:
         self.last_detection_time = 0
         self.min_detection_interval = 0.1  # Minimum 100ms between detections
         
+        # Requests run on worker threads; guards detection_cache and last_detection_time
+        self._lock = threading.Lock()
+        
         logger.info("✅ Hybrid detector initialized with MediaPipe + Roboflow")
     
     def detect_sign_fast(self, image_data: bytes) -> Dict:
@@ -55,7 +59,9 @@ class HybridSignDetector:
         start_time = time.time()
         
         # Rate limiting - avoid too frequent API calls
-        if time.time() - self.last_detection_time < self.min_detection_interval:
+        with self._lock:
+            rate_limited = time.time() - self.last_detection_time < self.min_detection_interval
+        if rate_limited:
             return {"success": False, "error": "Rate limited", "processing_time": 0}
         
         try:
@@ -94,7 +100,8 @@ class HybridSignDetector:
                 self._cache_result(image_hash, result)
             
             # Update timing
-            self.last_detection_time = time.time()
+            with self._lock:
+                self.last_detection_time = time.time()
             result["processing_time"] = time.time() - start_time
             result["from_cache"] = False
             
@@ -164,35 +171,38 @@ class HybridSignDetector:
     
     def _get_cached_result(self, image_hash: str) -> Optional[Dict]:
         """Get cached detection result if available and not expired"""
-        if image_hash in self.detection_cache:
-            cached_data = self.detection_cache[image_hash]
+        with self._lock:
+            cached_data = self.detection_cache.get(image_hash)
+            if cached_data is None:
+                return None
             
             # Check if cache is still valid
             if time.time() - cached_data["timestamp"] < self.cache_ttl:
-                return cached_data["result"]
-            else:
-                # Remove expired cache
-                del self.detection_cache[image_hash]
-        
-        return None
+                # Copy: the caller stamps timing fields on the result
+                return cached_data["result"].copy()
+            
+            # Remove expired cache
+            del self.detection_cache[image_hash]
+            return None
     
     def _cache_result(self, image_hash: str, result: Dict):
         """Cache detection result"""
-        # Clean old cache if too large
-        if len(self.detection_cache) >= self.max_cache_size:
-            # Remove oldest entries
-            oldest_keys = sorted(
-                self.detection_cache.keys(),
-                key=lambda k: self.detection_cache[k]["timestamp"]
-            )[:10]
-            for key in oldest_keys:
-                del self.detection_cache[key]
-        
-        # Add new cache entry
-        self.detection_cache[image_hash] = {
-            "result": result.copy(),
-            "timestamp": time.time()
-        }
+        with self._lock:
+            # Clean old cache if too large
+            if len(self.detection_cache) >= self.max_cache_size:
+                # Remove oldest entries
+                oldest_keys = sorted(
+                    self.detection_cache.keys(),
+                    key=lambda k: self.detection_cache[k]["timestamp"]
+                )[:10]
+                for key in oldest_keys:
+                    del self.detection_cache[key]
+            
+            # Add new cache entry
+            self.detection_cache[image_hash] = {
+                "result": result.copy(),
+                "timestamp": time.time()
+            }
     
     def _classify_hand_sign(self, cropped_hand: np.ndarray) -> Dict:
         """Classify hand sign using single Roboflow model"""
@@ -255,15 +265,17 @@ class HybridSignDetector:
     
     def get_performance_stats(self) -> Dict:
         """Get performance statistics"""
-        return {
-            "cache_size": len(self.detection_cache),
-            "cache_hit_ratio": "N/A",  # Could be implemented with counters
-            "last_detection_time": self.last_detection_time,
-            "min_detection_interval": self.min_detection_interval
-        }
+        with self._lock:
+            return {
+                "cache_size": len(self.detection_cache),
+                "cache_hit_ratio": "N/A",  # Could be implemented with counters
+                "last_detection_time": self.last_detection_time,
+                "min_detection_interval": self.min_detection_interval
+            }
     
     def clear_cache(self):
         """Clear detection cache"""
-        self.detection_cache.clear()
+        with self._lock:
+            self.detection_cache.clear()
         logger.info("🧹 Detection cache cleared")
 
@@ -0,0 +1,115 @@
+"""
+Image codec helpers for SmartSign
+JPEG decode/encode through libjpeg-turbo (PyTurboJPEG) when available, OpenCV otherwise
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _turbo: Optional["TurboJPEG"] = TurboJPEG()
+    logger.info("✅ Using libjpeg-turbo for JPEG decode/encode")
+except (ImportError, OSError, RuntimeError):
+    # Package or the native libturbojpeg library not installed
+    _turbo = None
+
+JPEG_MAGIC = b"\xff\xd8\xff"
+# An APP1 (EXIF) segment may carry an orientation tag, which cv2.imdecode
+# applies and TurboJPEG doesn't
+_APP1 = 0xE1
+_EXIF_HEADER = b"Exif\x00\x00"
+
+
+def _has_exif(data: bytes) -> bool:
+    """Whether the APPn segments after SOI include an EXIF APP1 (JFIF files put APP0 first)"""
+    pos = len(JPEG_MAGIC) - 1
+    while pos + 4 <= len(data) and data[pos] == 0xFF and 0xE0 <= data[pos + 1] <= 0xEF:
+        if data[pos + 1] == _APP1 and data[pos + 4:pos + 10] == _EXIF_HEADER:
+            return True
+        length = int.from_bytes(data[pos + 2:pos + 4], "big")
+        if length < 2:
+            break  # Corrupt segment length
+        pos += 2 + length
+    return False
+
+
+def decode_image(data: bytes) -> Optional[np.ndarray]:
+    """
+    Decode image bytes to a BGR array
+
+    Args:
+        data: Encoded image (JPEG, PNG, WebP...)
+
+    Returns:
+        BGR image, or None if the bytes could not be decoded
+    """
+    if _turbo is not None and data.startswith(JPEG_MAGIC) and not _has_exif(data):
+        try:
+            return _turbo.decode(data, pixel_format=TJPF_BGR)
+        except OSError:
+            pass  # Let OpenCV have a go (and report failure the usual way)
+
+    return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+
+
+def encode_jpeg(image: np.ndarray, quality: int = 85) -> bytes:
+    """
+    Encode a BGR array as JPEG
+
+    Args:
+        image: BGR image
+        quality: JPEG quality (1-100)
+
+    Returns:
+        JPEG bytes
+    """
+    if _turbo is not None:
+        return _turbo.encode(image, quality=quality, pixel_format=TJPF_BGR)
+
+    ok, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("Could not encode image as JPEG")
+    return buffer.tobytes()
+
+
+def downscale(image: np.ndarray, max_side: int) -> Tuple[np.ndarray, float]:
+    """
+    Shrink an image so its longest side is at most max_side
+
+    Returns:
+        Tuple of (possibly resized image, scale factor applied; 1.0 if untouched)
+    """
+    h, w = image.shape[:2]
+    scale = max_side / max(h, w)
+    if scale >= 1:
+        return image, 1.0
+    return cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA), scale
+
+
+def rescale_boxes(boxes: List[Dict[str, Any]], scale: float) -> List[Dict[str, Any]]:
+    """
+    Map boxes (and hand landmarks) detected on a downscaled image back to upload pixels, in place
+
+    Args:
+        boxes: Dicts with x/y/width/height and optional 'landmarks'
+        scale: Factor returned by downscale()
+    """
+    if scale == 1.0:
+        return boxes
+
+    factor = 1.0 / scale
+    for box in boxes:
+        for key in ("x", "y", "width", "height"):
+            if box.get(key) is not None:
+                box[key] *= factor
+        for point in (box.get("landmarks") or {}).get("coordinates", ()):
+            point["x"] *= factor
+            point["y"] *= factor
+            point["z"] *= factor
+    return boxes
@@ -0,0 +1,124 @@
+"""
+Interpretation Batcher for SmartSign
+Coalesces concurrent sign interpretation requests into a single GPT-4o-mini call
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional
+
+from openai import AsyncOpenAI
+
+from micro_batcher import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+# Matches numbered answer lines such as "1) I need help." or "2. Thank you."
+_NUMBERED_LINE = re.compile(r"^\s*(\d+)\s*[\).:-]\s*(.+?)\s*$")
+
+# Static instructions go in the system message (identical prefix -> eligible for
+# OpenAI prompt caching); only the recognized words travel in the user message
+BIM_SYSTEM_PROMPT = """You are interpreting Malaysian Sign Language (BIM) gestures.
+The user message lists the sign language words that were recognized.
+
+Convert these into a natural, short sentence that represents what the deaf person is trying to communicate.
+Keep it concise (under 15 words) and natural.
+
+Examples:
+- "help" → "I need help."
+- "passport, please" → "I need passport services, please."
+- "thank you" → "Thank you."
+
+Only respond with the interpreted sentence, nothing else."""
+
+BIM_BATCH_SYSTEM_PROMPT = """You are interpreting Malaysian Sign Language (BIM) gestures.
+Each numbered line of the user message lists sign language words recognized from a different person.
+
+For each line, write a natural, short sentence (under 15 words) that represents what the deaf person is trying to communicate.
+
+Examples:
+- "help" → "I need help."
+- "passport, please" → "I need passport services, please."
+- "thank you" → "Thank you."
+
+Respond with exactly one line per input, using the same numbering, e.g. "1) I need help."
+Only respond with the numbered sentences, nothing else."""
+
+# Interpretations are under 15 words, so 40 tokens leaves headroom without overpaying
+MAX_TOKENS_PER_SENTENCE = 40
+
+
+class InterpretBatcher(MicroBatcher[str, str]):
+    """
+    Buffers interpretation requests that arrive within a short window and sends
+    them to GPT-4o-mini as one numbered prompt, then scatters the answers back
+    to each waiting caller.
+    """
+
+    name = "Interpretation batcher"
+
+    def __init__(
+        self,
+        openai_client: Optional[AsyncOpenAI] = None,
+        window: float = 0.03,
+        max_batch_size: int = 16,
+    ):
+        super().__init__(window=window, max_batch_size=max_batch_size)
+        self.client = openai_client
+
+    async def submit(self, words: str) -> str:
+        """
+        Interpret a comma-separated list of recognized sign words
+
+        Args:
+            words: Recognized words, e.g. "tolong, saya"
+
+        Returns:
+            Natural language interpretation
+        """
+        return await super().submit(words)
+
+    async def _process_one(self, words: str) -> str:
+        return await self._interpret_one(words)
+
+    async def _process_many(self, phrases: List[str]) -> Dict[str, str]:
+        return await self._interpret_many(phrases)
+
+    async def _interpret_one(self, words: str) -> str:
+        """Interpret a single phrase"""
+        response = await self.client.chat.completions.create(
+            model="gpt-4o-mini",
+            max_tokens=MAX_TOKENS_PER_SENTENCE,
+            messages=[
+                {"role": "system", "content": BIM_SYSTEM_PROMPT},
+                {"role": "user", "content": words}
+            ]
+        )
+
+        return response.choices[0].message.content.strip()
+
+    async def _interpret_many(self, phrases: List[str]) -> Dict[str, str]:
+        """Interpret several phrases with one numbered prompt"""
+        numbered = "\n".join(f"{i}) {words}" for i, words in enumerate(phrases, 1))
+
+        response = await self.client.chat.completions.create(
+            model="gpt-4o-mini",
+            max_tokens=MAX_TOKENS_PER_SENTENCE * len(phrases),
+            messages=[
+                {"role": "system", "content": BIM_BATCH_SYSTEM_PROMPT},
+                {"role": "user", "content": numbered}
+            ]
+        )
+
+        answers = {}
+        for line in response.choices[0].message.content.splitlines():
+            match = _NUMBERED_LINE.match(line)
+            if match:
+                index = int(match.group(1)) - 1
+                if 0 <= index < len(phrases) and phrases[index] not in answers:
+                    answers[phrases[index]] = match.group(2)
+
+        if not answers:
+            raise ValueError("Could not parse batched interpretation response")
+
+        return answers
@@ -1,27 +1,40 @@
 """
 FastAPI server for BIM Sign Language Recognition using Hybrid Detection (MediaPipe + Roboflow) + OpenAI GPT-4o-mini
 """
-from fastapi import FastAPI, File, UploadFile, HTTPException, Body
+from fastapi import FastAPI, File, UploadFile, HTTPException, Body, Depends, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 from inference_sdk import InferenceHTTPClient
-from PIL import Image
-import tempfile
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import os
-import io
-from typing import Dict, Any, List
+import secrets
+import time
+from types import MappingProxyType
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
 import logging
-from openai import OpenAI
+import cv2
+import httpx
+import numpy as np
+import orjson
+from cachetools import TTLCache
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 from hybrid_detector import HybridSignDetector
 from multi_model_detector import MultiModelDetector
 from accurate_sign_detector import AccurateSignDetector
+from hand_detector import HandDetector
+from image_codec import decode_image, downscale, encode_jpeg, rescale_boxes
 
 # AI Features imports
 from models.visit_history import (
     VisitHistory,
     VisitStatus,
     DepartmentalLog,
+    PredictionResult,
+    CaseBrief,
     PredictIntentRequest,
     GenerateCaseBriefRequest,
     GenerateGreetingRequest,
@@ -29,6 +42,9 @@ from models.visit_history import (
 from prediction_engine import IntentPredictionEngine
 from case_brief_generator import CaseBriefGenerator
 from greeting_generator import GreetingGenerator
+from interpret_batcher import InterpretBatcher
+from prediction_batcher import PredictionBatcher
+from async_cache import AsyncLRUCache
 
 # Load environment variables
 load_dotenv()
@@ -41,21 +57,41 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="BIM Sign Language Recognition API",
     description="API for recognizing Malaysian Sign Language (BIM) using MediaPipe + Roboflow",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse  # orjson serializes prediction dicts much faster than stdlib json
 )
 
 # Configure CORS
+# Explicit origins (comma-separated ALLOWED_ORIGINS) let CORSMiddleware use exact matching;
+# "*" with credentials is also rejected by browsers
+ALLOWED_ORIGINS = tuple(
+    origin.strip()
+    for origin in os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000").split(",")
+    if origin.strip()
+)
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
+    allow_origins=list(ALLOWED_ORIGINS),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress larger JSON payloads (labels, visit history, case briefs, multi-model results);
+# level 6 gets nearly all of level 9's ratio on JSON for much less CPU
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=6)
+
 # Initialize API keys
-ROBOFLOW_API_KEY = os.getenv("ROBOFLOW_API_KEY", "PfNLBY9FSfXGfx9lccYk")
+ROBOFLOW_API_KEY = os.getenv("ROBOFLOW_API_KEY")
+if not ROBOFLOW_API_KEY:
+    raise RuntimeError("ROBOFLOW_API_KEY is not set; add it to backend/.env (run setup_env.py)")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# Required (as the X-Admin-Key header) by the cache maintenance endpoints; unset disables them
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+
+# Initialize Hand Detector once (MediaPipe graph setup is too expensive to repeat per request)
+hand_detector = HandDetector()
 
 # Initialize Accurate Sign Detector (MediaPipe hand detection + Roboflow classification)
 accurate_detector = AccurateSignDetector(roboflow_api_key=ROBOFLOW_API_KEY)
@@ -66,14 +102,37 @@ hybrid_detector = HybridSignDetector(roboflow_api_key=ROBOFLOW_API_KEY)
 # Initialize Multi-Model Detector (for comparison and visualization) - Legacy
 multi_model_detector = MultiModelDetector(roboflow_api_key=ROBOFLOW_API_KEY)
 
-# Initialize OpenAI client
-openai_client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+# One pooled HTTP/2 connection to OpenAI shared by every engine, so GPT/Whisper
+# calls reuse the TCP + TLS session instead of handshaking per request
+openai_http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    timeout=30
+) if OPENAI_API_KEY else None
+
+# Initialize OpenAI client (async so GPT/Whisper round trips don't block the event loop)
+openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=openai_http_client) if OPENAI_API_KEY else None
 
 # Initialize AI Feature Engines
 prediction_engine = IntentPredictionEngine(openai_client=openai_client)
 case_brief_generator = CaseBriefGenerator(openai_client=openai_client)
 greeting_generator = GreetingGenerator(openai_client=openai_client)
 
+# Coalesces concurrent sign interpretations into one GPT request
+interpret_batcher = InterpretBatcher(
+    openai_client=openai_client,
+    window=float(os.getenv("INTERPRET_BATCH_WINDOW_MS", "30")) / 1000
+)
+
+# Recognized labels come from a small vocabulary, so GPT interpretations are memoized
+interpretation_cache = AsyncLRUCache(maxsize=512)
+
+# Generated predictions / case briefs / greetings; keys start with (endpoint, user_id)
+ai_response_cache = AsyncLRUCache(maxsize=1024, ttl=3600)
+
+# Annotated multi-model images, served by /annotated/{key} instead of inline base64
+annotated_images = TTLCache(maxsize=128, ttl=60)
+
 # Legacy Roboflow client (for fallback)
 CLIENT = InferenceHTTPClient(
     api_url="https://detect.roboflow.com",
@@ -83,8 +142,25 @@ CLIENT = InferenceHTTPClient(
 # Single best model (used by hybrid detector)
 BEST_MODEL = "bim-recognition-x7qsz/10"
 
-# Demo mode: Global counter for alternating between "tolong" and "saya"
-_demo_detection_counter = 0
+# Largest accepted upload (bytes) for image endpoints
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+
+# Leading bytes of accepted image formats: JPEG, PNG (GIF is left out: cv2.imdecode can't read it)
+IMAGE_MAGIC_BYTES = (b"\xff\xd8\xff", b"\x89PNG\r\n\x1a\n")
+
+# Uploads are downscaled so their longest side is at most this many pixels before detection
+MAX_IMAGE_SIDE = int(os.getenv("MAX_IMAGE_SIDE", "640"))
+
+# Worker threads for blocking detector / Roboflow calls (sized to Roboflow's per-key concurrency)
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "20"))
+
+# Demo series slots: position -> (label, series state)
+DEMO_SERIES = (
+    ("tolong", "active"),
+    ("saya", "active"),
+    (None, "delay"),
+    (None, "delay"),
+)
 
 # Mapping from detected labels to sentences (Malaysian Sign Language focused)
 LABEL_TO_SENTENCE = {
@@ -132,9 +208,58 @@ LABEL_TO_SENTENCE = {
     "important": "[FILTERED: Not a Malaysian sign]",
 }
 
+# Read-only view with normalized keys, safe to share across worker threads
+LABEL_TO_SENTENCE = MappingProxyType({k.lower(): v for k, v in LABEL_TO_SENTENCE.items()})
+
+# Static responses are serialized once at import and served with a cache header
+STATIC_CACHE_HEADERS = {"Cache-Control": "public, max-age=300"}
+
+_ROOT_JSON = orjson.dumps({
+    "message": "BIM Sign Language Recognition API",
+    "status": "running",
+    "endpoints": {
+        "sign_to_text": "/sign-to-text (POST)",
+        "health": "/health (GET)"
+    }
+})
+
+_LABELS_JSON = orjson.dumps({
+    "labels": dict(LABEL_TO_SENTENCE),
+    "count": len(LABEL_TO_SENTENCE)
+})
+
+# Fixed part of /health, built once
+_HEALTH_STATUS = MappingProxyType({
+    "status": "healthy",
+    "accurate_detector": "enabled (MediaPipe + Roboflow)",
+    "hybrid_detector": "enabled (legacy)",
+    "multi_model_detector": "enabled (legacy)",
+    "best_model": BEST_MODEL,
+    "ai_model": "gpt-4o-mini",
+    "features": {
+        "hand_detection": "MediaPipe",
+        "sign_classification": "Roboflow Multi-Model",
+        "false_positive_filtering": "enabled",
+        "bounding_boxes": "always on hands"
+    }
+})
+
+def _static_json_response(body: bytes) -> Response:
+    """Wrap pre-serialized JSON bytes in a fresh, cacheable response"""
+    # A new Response per request: middleware (e.g. GZip) edits response headers in place
+    return Response(content=body, media_type="application/json", headers=STATIC_CACHE_HEADERS)
+
+def _fallback_interpretation(recognized_words: List[str]) -> str:
+    """Simple label mapping used when GPT is unavailable"""
+    if len(recognized_words) == 1:
+        return LABEL_TO_SENTENCE.get(recognized_words[0].lower(), f"Sign: {recognized_words[0]}")
+    return " ".join(recognized_words)
+
 async def interpret_with_ai(recognized_words: List[str]) -> str:
     """
     Use OpenAI GPT-4o-mini to interpret recognized sign language words into a natural sentence.
+    Results are memoized per word sequence; concurrent misses are coalesced into one
+    GPT request by the interpretation batcher.
     
     Args:
         recognized_words: List of recognized sign language words
@@ -144,77 +269,154 @@ async def interpret_with_ai(recognized_words: List[str]) -> str:
     """
     if not openai_client:
         logger.warning("OpenAI API key not configured, using fallback")
-        # Fallback to simple mapping
-        if len(recognized_words) == 1:
-            return LABEL_TO_SENTENCE.get(recognized_words[0].lower(), f"Sign: {recognized_words[0]}")
-        return " ".join(recognized_words)
+        return _fallback_interpretation(recognized_words)
     
     try:
-        words_str = ", ".join(recognized_words)
+        # Word order is kept in the key - "tolong, saya" and "saya, tolong" differ in meaning
+        cache_key = tuple(w.strip().lower() for w in recognized_words)
+        words_str = ", ".join(cache_key)
         logger.info(f"Interpreting words with AI: {words_str}")
         
-        response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            max_tokens=100,
-            messages=[{
-                "role": "user",
-                "content": f"""You are interpreting Malaysian Sign Language (BIM) gestures. 
-The following sign language words were recognized: {words_str}
-
-Convert these into a natural, short sentence that represents what the deaf person is trying to communicate. 
-Keep it concise (under 15 words) and natural.
-
-Examples:
-- "help" → "I need help."
-- "passport, please" → "I need passport services, please."
-- "thank you" → "Thank you."
-
-Only respond with the interpreted sentence, nothing else."""
-            }]
+        interpretation = await interpretation_cache.get_or_set(
+            cache_key, lambda: interpret_batcher.submit(words_str)
         )
-        
-        interpretation = response.choices[0].message.content.strip()
         logger.info(f"AI interpretation: {interpretation}")
         return interpretation
         
     except Exception as e:
         logger.error(f"AI interpretation failed: {str(e)}")
-        # Fallback to simple mapping
-        if len(recognized_words) == 1:
-            return LABEL_TO_SENTENCE.get(recognized_words[0].lower(), f"Sign: {recognized_words[0]}")
-        return " ".join(recognized_words)
+        return _fallback_interpretation(recognized_words)
+
+@app.on_event("startup")
+async def start_background_workers():
+    """Start background workers that need the running event loop"""
+    # Bound the pool used by asyncio.to_thread for blocking inference calls
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="inference")
+    )
+    logger.info(f"✅ Inference thread pool ready ({INFERENCE_WORKERS} workers)")
+
+    if openai_client:
+        interpret_batcher.start()
+        prediction_batcher.start()
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    """Stop background workers and close pooled connections"""
+    await interpret_batcher.stop()
+    await prediction_batcher.stop()
+    await multi_model_detector.aclose()
+
+    if openai_http_client:
+        await openai_http_client.aclose()
+
+async def read_image_upload(file: UploadFile) -> bytes:
+    """Validate the content type, size and magic bytes of an image upload"""
+    if not file.content_type or not file.content_type.startswith("image/"):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type: {file.content_type}. Please upload an image."
+        )
+
+    contents = await file.read(MAX_UPLOAD_BYTES + 1)
+    if len(contents) > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Image too large. Maximum size is {MAX_UPLOAD_BYTES} bytes."
+        )
+
+    # Cheap signature check rejects non-image payloads before any decode work
+    # WebP is a RIFF container; RIFF alone would also let WAV/AVI through
+    is_webp = contents[:4] == b"RIFF" and contents[8:12] == b"WEBP"
+    if not (contents.startswith(IMAGE_MAGIC_BYTES) or is_webp):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid image file: unrecognized image format"
+        )
+
+    return contents
+
+def decode_bgr(contents: bytes) -> np.ndarray:
+    """
+    Decode image bytes straight to a BGR array (libjpeg-turbo for JPEG when available)
+
+    Decoding doubles as validation, replacing the PIL verify + reopen + RGB->BGR
+    conversion passes.
+    """
+    image = decode_image(contents)
+    if image is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid image file: could not decode image"
+        )
+    return image
+
+def decode_downscaled(contents: bytes) -> Tuple[np.ndarray, float, Tuple[int, ...]]:
+    """
+    decode_bgr + downscale in one call, for running off the event loop
+
+    Returns:
+        Tuple of (working image, downscale() factor, original image shape)
+    """
+    original = decode_bgr(contents)
+    image, scale = downscale(original, MAX_IMAGE_SIDE)
+    return image, scale, original.shape
+
+class DecodedImage(NamedTuple):
+    """Validated upload shared by the image endpoints"""
+    contents: bytes      # Original upload bytes
+    image: np.ndarray    # BGR image, downscaled to at most MAX_IMAGE_SIDE
+    scale: float         # downscale() factor (1.0 if untouched)
+
+async def decoded_image(file: UploadFile = File(...)) -> DecodedImage:
+    """
+    Shared upload handling for the image endpoints
+
+    Validates the content type, reads at most MAX_UPLOAD_BYTES, decodes the
+    image once with OpenCV and downscales it to MAX_IMAGE_SIDE.
+
+    Returns:
+        DecodedImage with the original bytes, working image and scale
+    """
+    contents = await read_image_upload(file)
+    # Decoding a 10 MB upload takes long enough to stall every other request
+    image, scale, shape = await asyncio.to_thread(decode_downscaled, contents)
+
+    logger.info(f"📸 Received image: {file.filename} ({len(contents)} bytes, {shape[1]}x{shape[0]}, scale {scale:.2f})")
+    return DecodedImage(contents, image, scale)
+
+async def full_size_image(file: UploadFile = File(...)) -> DecodedImage:
+    """
+    Like decoded_image, but keeps the image at upload size
+
+    For endpoints that annotate the original frame and shrink what they send
+    to Roboflow themselves.
+    """
+    contents = await read_image_upload(file)
+    image = await asyncio.to_thread(decode_bgr, contents)
+
+    logger.info(f"📸 Received image: {file.filename} ({len(contents)} bytes, {image.shape[1]}x{image.shape[0]})")
+    return DecodedImage(contents, image, 1.0)
 
 @app.get("/")
 async def root():
     """Root endpoint"""
-    return {
-        "message": "BIM Sign Language Recognition API",
-        "status": "running",
-        "endpoints": {
-            "sign_to_text": "/sign-to-text (POST)",
-            "health": "/health (GET)"
-        }
-    }
+    return _static_json_response(_ROOT_JSON)
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    # Only the cache counters change between calls
     return {
-        "status": "healthy",
-        "accurate_detector": "enabled (MediaPipe + Roboflow)",
-        "hybrid_detector": "enabled (legacy)",
-        "multi_model_detector": "enabled (legacy)",
-        "best_model": BEST_MODEL,
-        "ai_model": "gpt-4o-mini",
-        "features": {
-            "hand_detection": "MediaPipe",
-            "sign_classification": "Roboflow Multi-Model",
-            "false_positive_filtering": "enabled",
-            "bounding_boxes": "always on hands"
-        }
+        **_HEALTH_STATUS,
+        "interpretation_cache": interpretation_cache.cache_info(),
+        "ai_response_cache": ai_response_cache.cache_info(),
+        "roboflow_cache": multi_model_detector.prediction_cache.cache_info()
     }
 
-@app.post("/detect-demo")
+# Detection routes skip response_model inference from the return annotation so the
+# dict goes straight to ORJSONResponse without a Pydantic validation/encode pass
+@app.post("/detect-demo", response_model=None)
 async def detect_demo(file: UploadFile = File(...)) -> Dict[str, Any]:
     """
     Demo mode detection - uses real hand detection but mocks sign labels
@@ -227,47 +429,39 @@ async def detect_demo(file: UploadFile = File(...)) -> Dict[str, Any]:
     Returns:
         JSON with real hand positions but mocked sign labels
     """
-    try:
-        # Validate file type
-        if not file.content_type.startswith("image/"):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type: {file.content_type}. Please upload an image."
-            )
-
-        # Read image contents
-        contents = await file.read()
-
-        # Validate image
-        try:
-            img = Image.open(io.BytesIO(contents))
-            img.verify()
-        except Exception as e:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid image file: {str(e)}"
-            )
-
-        # Use hand detector to get real hand positions
-        import cv2
-        import numpy as np
-        from hand_detector import HandDetector
-
-        # Convert image to numpy array
-        img = Image.open(io.BytesIO(contents))
-        img_array = np.array(img)
+    # Mock detection - Series pattern with delays
+    # Pattern: tolong (1s) → saya (1s) → delay (2s) → repeat
+    # Increment counter every second (no await in between, so this is atomic on the event loop)
+    current_second = int(time.time())
+    if current_second != detect_demo._last_second:
+        detect_demo._last_second = current_second
+        detect_demo._counter += 1
+
+    # Series pattern: 0=tolong, 1=saya, 2=delay, 3=delay, then repeat
+    counter = detect_demo._counter
+    position_in_series = counter % 4
+    current_label, series_state = DEMO_SERIES[position_in_series]
+
+    # During delay, don't return any new detections (skip decoding and MediaPipe entirely)
+    if series_state == "delay":
+        logger.info(f"🎭 Demo: Delay period (counter={counter})")
+        return {
+            "success": False,
+            "message": "Series delay - processing previous detections",
+            "bounding_boxes": [],
+            "num_hands": 0,
+            "series_state": "delay",
+            "position_in_series": position_in_series,
+            "method": "demo"
+        }
 
-        # Convert RGB to BGR for OpenCV
-        if len(img_array.shape) == 2:  # Grayscale
-            img_bgr = cv2.cvtColor(img_array, cv2.COLOR_GRAY2BGR)
-        elif img_array.shape[2] == 4:  # RGBA
-            img_bgr = cv2.cvtColor(img_array, cv2.COLOR_RGBA2BGR)
-        else:  # RGB
-            img_bgr = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
+    try:
+        # Read and decode image (OpenCV yields BGR directly)
+        contents = await read_image_upload(file)
+        img_bgr, scale, _ = await asyncio.to_thread(decode_downscaled, contents)
 
-        # Detect hands
-        hand_detector = HandDetector()
-        hand_detections = hand_detector.detect_hands(img_bgr)
+        # Detect hands with the shared detector (off the event loop)
+        hand_detections = await asyncio.to_thread(hand_detector.detect_hands, img_bgr)
 
         if not hand_detections:
             return {
@@ -278,47 +472,6 @@ async def detect_demo(file: UploadFile = File(...)) -> Dict[str, Any]:
                 "method": "demo"
             }
 
-        # Mock detection - Series pattern with delays
-        # Pattern: tolong (1s) → saya (1s) → delay (2s) → repeat
-        global _demo_detection_counter
-        import time
-
-        # Increment counter every second
-        current_second = int(time.time())
-        if not hasattr(detect_demo, '_last_second'):
-            detect_demo._last_second = current_second
-            _demo_detection_counter = 0
-        elif current_second != detect_demo._last_second:
-            detect_demo._last_second = current_second
-            _demo_detection_counter += 1
-
-        # Series pattern: 0=tolong, 1=saya, 2=delay, 3=delay, then repeat
-        position_in_series = _demo_detection_counter % 4
-
-        if position_in_series == 0:
-            current_label = "tolong"
-            series_state = "active"
-        elif position_in_series == 1:
-            current_label = "saya"
-            series_state = "active"
-        else:
-            # Delay period (positions 2 and 3)
-            current_label = None
-            series_state = "delay"
-
-        # During delay, don't return any new detections
-        if series_state == "delay":
-            logger.info(f"🎭 Demo: Delay period (counter={_demo_detection_counter})")
-            return {
-                "success": False,
-                "message": "Series delay - processing previous detections",
-                "bounding_boxes": [],
-                "num_hands": len(hand_detections),
-                "series_state": "delay",
-                "position_in_series": position_in_series,
-                "method": "demo"
-            }
-
         # Convert hand detections to bounding boxes with mocked labels
         bounding_boxes = []
         for detection in hand_detections:
@@ -346,7 +499,7 @@ async def detect_demo(file: UploadFile = File(...)) -> Dict[str, Any]:
             "confidence": 0.95,
             "model_used": "demo",
             "hand": hand_detections[0]['hand_label'],
-            "bounding_boxes": bounding_boxes,
+            "bounding_boxes": rescale_boxes(bounding_boxes, scale),
             "num_hands": len(hand_detections),
             "processing_time": 0.05,
             "series_state": series_state,
@@ -360,54 +513,42 @@ async def detect_demo(file: UploadFile = File(...)) -> Dict[str, Any]:
         logger.error(f"❌ Demo detection failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
 
-@app.post("/detect-accurate")
-async def detect_accurate(file: UploadFile = File(...)) -> Dict[str, Any]:
+# Demo series state: counter advances once per wall-clock second seen
+# (starts at -1 so the first request lands on "tolong", as before)
+detect_demo._last_second = 0
+detect_demo._counter = -1
+
+@app.post("/detect-accurate", response_model=None)
+async def detect_accurate(img_ctx: DecodedImage = Depends(decoded_image)) -> Dict[str, Any]:
     """
     Accurate sign detection using MediaPipe hand detection + Roboflow classification
     Ensures bounding boxes are always on actual hands, filters false positives
 
     Args:
-        file: Uploaded image file
+        img_ctx: Validated, decoded upload
 
     Returns:
         JSON with detected signs, bounding boxes, and confidence
     """
+    img_bgr = img_ctx.image
+
     try:
-        # Validate file type
-        if not file.content_type.startswith("image/"):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type: {file.content_type}. Please upload an image."
-            )
-        
-        # Read image contents
-        contents = await file.read()
-        
-        # Validate image
-        try:
-            img = Image.open(io.BytesIO(contents))
-            img.verify()
-        except Exception as e:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid image file: {str(e)}"
-            )
-        
-        # Detect signs using accurate detector
+        # Detect signs using accurate detector (reuses the already decoded image)
         logger.info("🔍 Running accurate sign detection (MediaPipe + Roboflow)...")
-        result = accurate_detector.detect_signs(contents)
+        result = await asyncio.to_thread(accurate_detector.detect_signs_in_image, img_bgr)
         
         if result['success']:
-            logger.info(f"✅ Detected: {result['label']} ({result['confidence']:.2%}) on {result['hand']} hand")
+            label = result['label']
+            logger.info(f"✅ Detected: {label} ({result['confidence']:.2%}) on {result['hand']} hand")
             
             return {
                 "success": True,
-                "label": result['label'],
-                "text": LABEL_TO_SENTENCE.get(result['label'].lower(), result['label']),
+                "label": label,
+                "text": LABEL_TO_SENTENCE.get(label.lower(), label),
                 "confidence": result['confidence'],
                 "model_used": result['model_used'],
                 "hand": result['hand'],
-                "bounding_boxes": result['bounding_boxes'],
+                "bounding_boxes": rescale_boxes(result['bounding_boxes'], img_ctx.scale),
                 "num_hands": result['num_hands'],
                 "processing_time": result['processing_time'],
                 "method": "MediaPipe + Roboflow"
@@ -417,7 +558,7 @@ async def detect_accurate(file: UploadFile = File(...)) -> Dict[str, Any]:
             return {
                 "success": False,
                 "message": result.get('message', 'No confident detection'),
-                "bounding_boxes": result.get('bounding_boxes', []),
+                "bounding_boxes": rescale_boxes(result.get('bounding_boxes', []), img_ctx.scale),
                 "num_hands": result.get('num_hands', 0),
                 "processing_time": result['processing_time'],
                 "method": "MediaPipe + Roboflow"
@@ -429,66 +570,55 @@ async def detect_accurate(file: UploadFile = File(...)) -> Dict[str, Any]:
         logger.error(f"❌ Accurate detection failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
 
-@app.get("/models")
-async def get_models():
-    """Get information about all available models"""
-    return multi_model_detector.get_model_info()
-
-@app.post("/sign-to-text")
+@app.post("/sign-to-text", response_model=None)
 async def sign_to_text(
-    file: UploadFile = File(...),
-    model: str = "primary"  # Legacy endpoint - use /sign-to-text-fast for better performance
+    img_ctx: DecodedImage = Depends(decoded_image),
+    model: str = "primary",  # Legacy endpoint - use /sign-to-text-fast for better performance
+    include_all: bool = False
 ) -> Dict[str, Any]:
     """
     Convert sign language image to text
     
     Args:
-        file: Uploaded image file
+        img_ctx: Validated, decoded upload
         model: Model to use ("primary" or "secondary")
+        include_all: Also return every raw prediction (off by default to keep responses small)
         
     Returns:
         JSON with label, text, and confidence
     """
-    temp_file_path = None
+    contents, img_bgr = img_ctx.contents, img_ctx.image
     
     try:
-        # Validate file type
-        if not file.content_type.startswith("image/"):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type: {file.content_type}. Please upload an image."
-            )
-        
-        # Read image contents
-        contents = await file.read()
-        
-        # Validate image by trying to open it
-        try:
-            img = Image.open(io.BytesIO(contents))
-            img.verify()  # Verify it's a valid image
-        except Exception as e:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid image file: {str(e)}"
-            )
-        
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as temp_file:
-            temp_file.write(contents)
-            temp_file_path = temp_file.name
-        
         # Use best model (legacy endpoint)
         model_id = BEST_MODEL
-        logger.info(f"Processing image: {file.filename} (size: {len(contents)} bytes) with model: {model_id} (legacy endpoint)")
+        logger.info(f"Processing image ({len(contents)} bytes) with model: {model_id} (legacy endpoint)")
         
-        # Run inference
-        result = CLIENT.infer(temp_file_path, model_id=model_id)
+        # Run inference on the decoded array (no temp file round trip)
+        result = await asyncio.to_thread(CLIENT.infer, img_bgr, model_id=model_id)
         
         # Process predictions
         if "predictions" in result and result["predictions"]:
-            # Get the prediction with highest confidence
             predictions = result["predictions"]
-            best_prediction = max(predictions, key=lambda x: x.get("confidence", 0))
+            
+            # Single pass: find the most confident prediction and, only when
+            # the caller asks for it, materialize the raw prediction list
+            all_predictions = []
+            best_prediction = predictions[0]
+            best_confidence = -1.0
+            for pred in predictions:
+                if include_all:
+                    all_predictions.append({
+                        "class": pred.get("class"),
+                        "confidence": pred.get("confidence"),
+                        "x": pred.get("x"),
+                        "y": pred.get("y"),
+                        "width": pred.get("width"),
+                        "height": pred.get("height")
+                    })
+                conf = pred.get("confidence", 0)
+                if conf > best_confidence:
+                    best_prediction, best_confidence = pred, conf
             
             label = best_prediction.get("class", "unknown")
             confidence = best_prediction.get("confidence", 0.0)
@@ -504,17 +634,7 @@ async def sign_to_text(
                 "text": text,
                 "confidence": confidence,
                 "model_used": model_id,
-                "all_predictions": [
-                    {
-                        "class": pred.get("class"),
-                        "confidence": pred.get("confidence"),
-                        "x": pred.get("x"),
-                        "y": pred.get("y"),
-                        "width": pred.get("width"),
-                        "height": pred.get("height")
-                    }
-                    for pred in predictions
-                ]
+                "all_predictions": rescale_boxes(all_predictions, img_ctx.scale)
             }
         else:
             logger.warning("No predictions found in the image")
@@ -535,36 +655,40 @@ async def sign_to_text(
             status_code=500,
             detail=f"Error processing image: {str(e)}"
         )
-    finally:
-        # Clean up temporary file
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.unlink(temp_file_path)
-            except Exception as e:
-                logger.warning(f"Failed to delete temp file: {e}")
 
 @app.get("/labels")
 async def get_labels():
     """Get all available label mappings"""
-    return {
-        "labels": LABEL_TO_SENTENCE,
-        "count": len(LABEL_TO_SENTENCE)
-    }
+    return _static_json_response(_LABELS_JSON)
+
+# Static description of the hybrid detector served by /models
+_HYBRID_DETECTOR_INFO = {
+    "model": BEST_MODEL,
+    "description": "Hybrid detector using MediaPipe + Roboflow for optimal performance",
+    "features": ["hand_detection", "region_cropping", "caching", "single_model"]
+}
+
+# The multi-model lineup is fixed at startup
+_MULTI_MODEL_INFO = multi_model_detector.get_model_info()
+
+# Dashboard polls within a second share one stats snapshot
+_stats_cache = TTLCache(maxsize=1, ttl=1.0)
 
 @app.get("/models")
 async def get_models():
-    """Get available models"""
+    """Get available models (hybrid detector, its live stats and the multi-model lineup)"""
+    stats = _stats_cache.get("stats")
+    if stats is None:
+        stats = _stats_cache["stats"] = hybrid_detector.get_performance_stats()
+
     return {
-        "hybrid_detector": {
-            "model": BEST_MODEL,
-            "description": "Hybrid detector using MediaPipe + Roboflow for optimal performance",
-            "features": ["hand_detection", "region_cropping", "caching", "single_model"]
-        },
-        "performance_stats": hybrid_detector.get_performance_stats()
+        "hybrid_detector": _HYBRID_DETECTOR_INFO,
+        "performance_stats": stats,
+        "model_info": _MULTI_MODEL_INFO
     }
 
-@app.post("/sign-to-text-fast")
-async def sign_to_text_fast(file: UploadFile = File(...)) -> Dict[str, Any]:
+@app.post("/sign-to-text-fast", response_model=None)
+async def sign_to_text_fast(img_ctx: DecodedImage = Depends(decoded_image)) -> Dict[str, Any]:
     """
     FAST sign language detection using Hybrid Detector (MediaPipe + Single Roboflow Model)
     
@@ -574,20 +698,15 @@ async def sign_to_text_fast(file: UploadFile = File(...)) -> Dict[str, Any]:
     - Image preprocessing and caching
     - 3-5x faster than multi-model approach
     """
+    # Send the downscaled image when the upload was shrunk; this endpoint returns
+    # no coordinates so nothing needs rescaling
+    contents = img_ctx.contents
+    if img_ctx.scale < 1:
+        contents = await asyncio.to_thread(encode_jpeg, img_ctx.image, 85)
+    
     try:
-        # Validate file type
-        if not file.content_type.startswith("image/"):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type: {file.content_type}. Please upload an image."
-            )
-        
-        # Read image contents
-        contents = await file.read()
-        logger.info(f"📸 Processing image: {file.filename} ({len(contents)} bytes)")
-        
         # Use hybrid detector for fast detection
-        detection_result = hybrid_detector.detect_sign_fast(contents)
+        detection_result = await asyncio.to_thread(hybrid_detector.detect_sign_fast, contents)
         
         if detection_result.get("success"):
             label = detection_result.get("label", "unknown")
@@ -628,42 +747,35 @@ async def sign_to_text_fast(file: UploadFile = File(...)) -> Dict[str, Any]:
             detail=f"Error processing image: {str(e)}"
         )
 
-@app.post("/sign-to-text-multi")
-async def sign_to_text_multi(file: UploadFile = File(...)) -> Dict[str, Any]:
+@app.post("/sign-to-text-multi", response_model=None)
+async def sign_to_text_multi(
+    request: Request,
+    img_ctx: DecodedImage = Depends(full_size_image),
+    render: bool = True
+) -> Dict[str, Any]:
     """
     Convert sign language image to text using multiple models with bounding box visualization
     
     Args:
-        file: Uploaded image file
+        request: Incoming request (used to build the absolute annotated image URL)
+        img_ctx: Validated upload, decoded at full size
+        render: Query param; false skips drawing/encoding the annotated image
+            (annotated_image_url is then null)
         
     Returns:
-        JSON with results from all models including bounding boxes and annotated image
+        JSON with results from all models including bounding boxes and an annotated image URL
     """
+    # Full resolution: the annotated image and its boxes must stay at upload size
+    # (the detector shrinks what it sends to Roboflow and maps the boxes back)
+    contents = img_ctx.contents
+    
     try:
-        # Validate file type
-        if not file.content_type.startswith("image/"):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type: {file.content_type}. Please upload an image."
-            )
-        
-        # Read image contents
-        contents = await file.read()
-        
-        # Validate image by trying to open it
-        try:
-            img = Image.open(io.BytesIO(contents))
-            img.verify()  # Verify it's a valid image
-        except Exception as e:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid image file: {str(e)}"
-            )
-        
-        logger.info(f"📸 Processing image with multi-model detector: {file.filename} ({len(contents)} bytes)")
+        logger.info(f"📸 Processing image with multi-model detector ({len(contents)} bytes)")
         
         # Use multi-model detector to get all predictions with bounding boxes
-        detection_result = multi_model_detector.detect_all_models(contents)
+        detection_result = await multi_model_detector.detect_all_models_async(
+            contents, render=render, image=img_ctx.image
+        )
         
         if not detection_result.get("success"):
             raise HTTPException(
@@ -671,6 +783,15 @@ async def sign_to_text_multi(file: UploadFile = File(...)) -> Dict[str, Any]:
                 detail=detection_result.get("error", "Multi-model detection failed")
             )
         
+        # Keep the annotated JPEG out of the JSON; identical frames share one entry
+        annotated_image_url = None
+        if render:
+            # Reuse the detector's content hash; absolute URL because the frontend
+            # is served from a different origin than the API
+            annotated_key = detection_result["image_digest"]
+            annotated_images[annotated_key] = detection_result["annotated_image"]
+            annotated_image_url = str(request.url_for("get_annotated_image", key=annotated_key))
+        
         # Get best overall prediction
         best_overall = detection_result.get("best_overall")
         
@@ -691,7 +812,7 @@ async def sign_to_text_multi(file: UploadFile = File(...)) -> Dict[str, Any]:
                 "ai_interpretation": ai_interpretation
             },
             "models": detection_result.get("models", {}),
-            "annotated_image": detection_result.get("annotated_image"),
+            "annotated_image_url": annotated_image_url,
             "total_models": detection_result.get("total_models", 0),
             "models_with_detections": detection_result.get("models_with_detections", 0),
             "method": "multi_model_with_bbox"
@@ -706,7 +827,16 @@ async def sign_to_text_multi(file: UploadFile = File(...)) -> Dict[str, Any]:
             detail=f"Error processing image: {str(e)}"
         )
 
-@app.post("/speech-to-text")
+@app.get("/annotated/{key}")
+async def get_annotated_image(key: str):
+    """Serve an annotated image produced by /sign-to-text-multi (kept for 60 seconds)"""
+    image_bytes = annotated_images.get(key)
+    if image_bytes is None:
+        raise HTTPException(status_code=404, detail="Annotated image not found or expired")
+    
+    return Response(content=image_bytes, media_type="image/jpeg", headers={"Cache-Control": "public, max-age=60"})
+
+@app.post("/speech-to-text", response_model=None)
 async def speech_to_text(audio: UploadFile = File(...)) -> Dict[str, Any]:
     """
     Convert speech audio to text using OpenAI Whisper API
@@ -729,33 +859,22 @@ async def speech_to_text(audio: UploadFile = File(...)) -> Dict[str, Any]:
         # Read audio file
         audio_data = await audio.read()
         
-        # Create temporary file for OpenAI API
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as temp_audio:
-            temp_audio.write(audio_data)
-            temp_audio_path = temp_audio.name
+        # Transcribe using OpenAI Whisper (upload straight from memory;
+        # the filename extension tells Whisper the audio format)
+        transcript = await openai_client.audio.transcriptions.create(
+            model="whisper-1",
+            file=(audio.filename or "audio.webm", audio_data, audio.content_type or "audio/webm"),
+            language="ms"  # Malay language
+        )
         
-        try:
-            # Transcribe using OpenAI Whisper
-            with open(temp_audio_path, "rb") as audio_file:
-                transcript = openai_client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language="ms"  # Malay language
-                )
-            
-            transcribed_text = transcript.text
-            logger.info(f"✅ Transcription: {transcribed_text}")
-            
-            return {
-                "success": True,
-                "text": transcribed_text,
-                "language": "ms"
-            }
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_audio_path):
-                os.unlink(temp_audio_path)
+        transcribed_text = transcript.text
+        logger.info(f"✅ Transcription: {transcribed_text}")
+        
+        return {
+            "success": True,
+            "text": transcribed_text,
+            "language": "ms"
+        }
                 
     except Exception as e:
         logger.error(f"❌ Speech-to-text error: {str(e)}", exc_info=True)
@@ -864,324 +983,24 @@ MOCK_USER_PROFILES = {
     }
 }
 
+# Mock data for the AI features demo lives in backend/mocks/*.json,
+# parsed once at import instead of compiled as giant dict literals
+MOCKS_DIR = os.path.join(os.path.dirname(__file__), "mocks")
+
+def _load_mock(filename: str) -> Any:
+    """Load a mock data file from MOCKS_DIR"""
+    with open(os.path.join(MOCKS_DIR, filename), "rb") as f:
+        return orjson.loads(f.read())
+
 # Mock Visit History Database (for AI Features demo)
-MOCK_VISIT_HISTORY: Dict[str, List[Dict]] = {
-    "900125-14-0123": [  # Ahmad bin Abdullah
-        {
-            "id": "VH-001",
-            "user_id": "900125-14-0123",
-            "location": "Immigration",
-            "department": "Jabatan Imigresen Malaysia",
-            "datetime": "2025-01-05T09:30:00",
-            "application": "Passport Renewal",
-            "queue": "A032",
-            "status": "In Progress",
-            "documents_requested": ["Old Passport", "IC"],
-            "documents_submitted": ["Old Passport"],
-            "handling_time_minutes": 45,
-            "officer_notes": "Citizen needs to submit IC copy",
-            "phrases_detected": ["tolong", "saya", "passport"],
-            "follow_up_required": True,
-            "follow_up_date": "2025-01-12",
-            "preferred_language": "BIM"
-        },
-        {
-            "id": "VH-002",
-            "user_id": "900125-14-0123",
-            "location": "JKM",
-            "department": "Jabatan Kebajikan Masyarakat",
-            "datetime": "2025-01-02T14:00:00",
-            "application": "Bantuan OKU Renewal",
-            "queue": "W015",
-            "status": "Completed",
-            "documents_requested": ["Bank Statement", "OKU Card"],
-            "documents_submitted": ["OKU Card"],
-            "handling_time_minutes": 30,
-            "officer_notes": "Bank statement still pending",
-            "phrases_detected": ["tolong", "bantuan"],
-            "follow_up_required": True,
-            "follow_up_date": "2025-01-10",
-            "preferred_language": "BIM"
-        },
-        {
-            "id": "VH-003",
-            "user_id": "900125-14-0123",
-            "location": "JPJ",
-            "department": "Jabatan Pengangkutan Jalan",
-            "datetime": "2024-12-28T10:15:00",
-            "application": "Renew Roadtax",
-            "queue": "B089",
-            "status": "Completed",
-            "documents_requested": ["Vehicle Registration Card", "Insurance"],
-            "documents_submitted": ["Vehicle Registration Card", "Insurance"],
-            "handling_time_minutes": 20,
-            "officer_notes": None,
-            "phrases_detected": ["tolong", "roadtax"],
-            "follow_up_required": False,
-            "follow_up_date": None,
-            "preferred_language": "BIM"
-        },
-        {
-            "id": "VH-004",
-            "user_id": "900125-14-0123",
-            "location": "Klinik Kesihatan",
-            "department": "Kementerian Kesihatan Malaysia",
-            "datetime": "2024-12-22T08:45:00",
-            "application": "Medical Checkup",
-            "queue": "M045",
-            "status": "Completed",
-            "documents_requested": [],
-            "documents_submitted": ["IC", "Medical Card"],
-            "handling_time_minutes": 40,
-            "officer_notes": None,
-            "phrases_detected": ["terima kasih", "sihat"],
-            "follow_up_required": False,
-            "follow_up_date": None,
-            "preferred_language": "BIM"
-        },
-        {
-            "id": "VH-005",
-            "user_id": "900125-14-0123",
-            "location": "KWSP (EPF)",
-            "department": "Kumpulan Wang Simpanan Pekerja",
-            "datetime": "2024-12-15T14:20:00",
-            "application": "Update Personal Details",
-            "queue": "E102",
-            "status": "Completed",
-            "documents_requested": [],
-            "documents_submitted": ["IC", "Marriage Certificate"],
-            "handling_time_minutes": 25,
-            "officer_notes": None,
-            "phrases_detected": ["tolong", "update"],
-            "follow_up_required": False,
-            "follow_up_date": None,
-            "preferred_language": "BIM"
-        },
-        {
-            "id": "VH-006",
-            "user_id": "900125-14-0123",
-            "location": "Pejabat Pos",
-            "department": "Pos Malaysia",
-            "datetime": "2024-12-08T11:30:00",
-            "application": "Parcel Collection",
-            "queue": "P025",
-            "status": "Completed",
-            "documents_requested": [],
-            "documents_submitted": ["IC", "Collection Notice"],
-            "handling_time_minutes": 15,
-            "officer_notes": None,
-            "phrases_detected": ["terima kasih"],
-            "follow_up_required": False,
-            "follow_up_date": None,
-            "preferred_language": "BIM"
-        },
-        {
-            "id": "VH-007",
-            "user_id": "900125-14-0123",
-            "location": "LHDN",
-            "department": "Lembaga Hasil Dalam Negeri",
-            "datetime": "2024-11-28T09:00:00",
-            "application": "Income Tax Filing",
-            "queue": "T018",
-            "status": "Completed",
-            "documents_requested": ["EA Form", "Receipts"],
-            "documents_submitted": ["EA Form", "Receipts"],
-            "handling_time_minutes": 35,
-            "officer_notes": None,
-            "phrases_detected": ["tolong", "cukai"],
-            "follow_up_required": False,
-            "follow_up_date": None,
-            "preferred_language": "BIM"
-        },
-        {
-            "id": "VH-008",
-            "user_id": "900125-14-0123",
-            "location": "JPN",
-            "department": "Jabatan Pendaftaran Negara",
-            "datetime": "2024-11-20T10:45:00",
-            "application": "Birth Certificate Collection",
-            "queue": "N032",
-            "status": "Completed",
-            "documents_requested": [],
-            "documents_submitted": ["IC", "Payment Receipt"],
-            "handling_time_minutes": 20,
-            "officer_notes": None,
-            "phrases_detected": ["terima kasih"],
-            "follow_up_required": False,
-            "follow_up_date": None,
-            "preferred_language": "BIM"
-        },
-        {
-            "id": "VH-009",
-            "user_id": "900125-14-0123",
-            "location": "Majlis Bandaraya",
-            "department": "Dewan Bandaraya Kuala Lumpur",
-            "datetime": "2024-11-15T13:30:00",
-            "application": "Pay Compound Fine",
-            "queue": "C058",
-            "status": "Completed",
-            "documents_requested": [],
-            "documents_submitted": ["IC", "Summons Notice"],
-            "handling_time_minutes": 18,
-            "officer_notes": None,
-            "phrases_detected": ["tolong", "bayar"],
-            "follow_up_required": False,
-            "follow_up_date": None,
-            "preferred_language": "BIM"
-        },
-        {
-            "id": "VH-010",
-            "user_id": "900125-14-0123",
-            "location": "TNB",
-            "department": "Tenaga Nasional Berhad",
-            "datetime": "2024-11-10T15:00:00",
-            "application": "Electricity Bill Payment",
-            "queue": "U012",
-            "status": "Completed",
-            "documents_requested": [],
-            "documents_submitted": ["Bill Statement"],
-            "handling_time_minutes": 12,
-            "officer_notes": None,
-            "phrases_detected": ["terima kasih"],
-            "follow_up_required": False,
-            "follow_up_date": None,
-            "preferred_language": "BIM"
-        }
-    ],
-    "970512-05-1234": [  # Lim Wei Ming
-        {
-            "id": "VH-004",
-            "user_id": "970512-05-1234",
-            "location": "JPN",
-            "department": "Jabatan Pendaftaran Negara",
-            "datetime": "2025-01-03T10:00:00",
-            "application": "IC Replacement",
-            "queue": "C045",
-            "status": "In Progress",
-            "documents_requested": ["Police Report", "Birth Certificate"],
-            "documents_submitted": ["Police Report"],
-            "handling_time_minutes": 40,
-            "officer_notes": "Waiting for birth certificate",
-            "phrases_detected": ["tolong", "IC"],
-            "follow_up_required": True,
-            "follow_up_date": "2025-01-15",
-            "preferred_language": "BIM"
-        }
-    ],
-    "830901-01-0123": [  # Priya Devi
-        {
-            "id": "VH-005",
-            "user_id": "830901-01-0123",
-            "location": "Hospital",
-            "department": "Hospital Kuala Lumpur",
-            "datetime": "2025-01-04T08:30:00",
-            "application": "Medical Checkup",
-            "queue": "M012",
-            "status": "Completed",
-            "documents_requested": [],
-            "documents_submitted": ["IC", "OKU Card"],
-            "handling_time_minutes": 60,
-            "officer_notes": None,
-            "phrases_detected": ["terima kasih", "sihat"],
-            "follow_up_required": False,
-            "follow_up_date": None,
-            "preferred_language": "BIM"
-        },
-        {
-            "id": "VH-006",
-            "user_id": "830901-01-0123",
-            "location": "JKM",
-            "department": "Jabatan Kebajikan Masyarakat",
-            "datetime": "2024-12-20T11:00:00",
-            "application": "OKU Card Application",
-            "queue": "W008",
-            "status": "Completed",
-            "documents_requested": ["Medical Report", "Passport Photos"],
-            "documents_submitted": ["Medical Report", "Passport Photos"],
-            "handling_time_minutes": 35,
-            "officer_notes": "OKU card approved, will be ready in 2 weeks",
-            "phrases_detected": ["tolong", "saya", "OKU"],
-            "follow_up_required": False,
-            "follow_up_date": None,
-            "preferred_language": "BIM"
-        }
-    ],
-    "001231-01-0123": [  # Sarah binti Mohd
-        {
-            "id": "VH-007",
-            "user_id": "001231-01-0123",
-            "location": "LHDN",
-            "department": "Lembaga Hasil Dalam Negeri",
-            "datetime": "2025-01-06T09:00:00",
-            "application": "Tax Filing Assistance",
-            "queue": "T021",
-            "status": "Pending",
-            "documents_requested": ["EA Form", "Bank Statement"],
-            "documents_submitted": [],
-            "handling_time_minutes": None,
-            "officer_notes": "Scheduled appointment",
-            "phrases_detected": [],
-            "follow_up_required": True,
-            "follow_up_date": "2025-01-13",
-            "preferred_language": "BIM"
-        }
-    ]
-}
+MOCK_VISIT_HISTORY: Dict[str, List[Dict]] = _load_mock("visit_history.json")
 
 # Mock Departmental Logs (inter-departmental communication)
-MOCK_DEPARTMENTAL_LOGS: Dict[str, List[Dict]] = {
-    "900125-14-0123": [
-        {
-            "department": "JKM",
-            "date": "2025-01-02",
-            "action_type": "document_request",
-            "summary": "Requested bank statement for Bantuan OKU verification",
-            "related_documents": ["Bank Statement (last 3 months)"],
-            "officer_department": "JKM Welfare Division"
-        },
-        {
-            "department": "Immigration",
-            "date": "2025-01-05",
-            "action_type": "document_request",
-            "summary": "IC copy needed for passport renewal verification",
-            "related_documents": ["IC Copy (front and back)"],
-            "officer_department": "Immigration Passport Unit"
-        }
-    ],
-    "970512-05-1234": [
-        {
-            "department": "JPN",
-            "date": "2025-01-03",
-            "action_type": "document_request",
-            "summary": "Birth certificate required for IC replacement",
-            "related_documents": ["Birth Certificate (original or certified copy)"],
-            "officer_department": "JPN Registration Division"
-        }
-    ],
-    "830901-01-0123": [
-        {
-            "department": "Hospital KL",
-            "date": "2025-01-04",
-            "action_type": "referral",
-            "summary": "Follow-up appointment scheduled for hearing assessment",
-            "related_documents": [],
-            "officer_department": "ENT Department"
-        }
-    ],
-    "001231-01-0123": [
-        {
-            "department": "LHDN",
-            "date": "2025-01-06",
-            "action_type": "appointment_scheduled",
-            "summary": "Tax filing assistance appointment confirmed",
-            "related_documents": ["EA Form", "Bank Statement"],
-            "officer_department": "LHDN Customer Service"
-        }
-    ]
-}
+MOCK_DEPARTMENTAL_LOGS: Dict[str, List[Dict]] = _load_mock("departmental_logs.json")
 
-@app.post("/lookup-id")
-async def lookup_id(request: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
+# Profiles are pre-serialized once (_PROFILE_RESPONSES), so lookups send those bytes as-is
+@app.post("/lookup-id", response_model=None)
+async def lookup_id(request: Dict[str, Any] = Body(...)) -> Response:
     """
     Look up user profile by ID number
 
@@ -1192,7 +1011,7 @@ async def lookup_id(request: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
         User profile information or error
     """
     try:
-        id_number = request.get("id_number", "").strip().upper()
+        id_number = request.get("id_number", "").strip()
         
         if not id_number:
             raise HTTPException(
@@ -1200,73 +1019,207 @@ async def lookup_id(request: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
                 detail="ID number is required"
             )
         
-        logger.info(f"🔍 Looking up ID: {id_number}")
+        logger.info("🔍 Looking up ID: %s", id_number)
         
-        # Look up in mock database
-        profile = MOCK_USER_PROFILES.get(id_number)
+        # Look up in mock database (scanned IDs may come with or without dashes)
+        profile = _PROFILES_BY_NORMALIZED_IC.get(_normalize_ic(id_number))
 
         if not profile:
             # Default to Ahmad bin Abdullah profile (for demo)
-            logger.warning(f"⚠️ ID {id_number} not found, defaulting to Ahmad bin Abdullah")
+            logger.warning("⚠️ ID %s not found, defaulting to Ahmad bin Abdullah", id_number)
 
             # Always use Ahmad bin Abdullah's profile as default
+            # (keeps its own IC number rather than the scanned ID; nothing mutates it)
             profile = MOCK_USER_PROFILES.get("900125-14-0123")
-
-            # Keep the original IC number from the profile (don't replace with scanned ID)
-            profile = profile.copy()
         
-        logger.info(f"✅ Profile found: {profile['name']} ({profile['disability_level']})")
+        logger.info("✅ Profile found: %s (%s)", profile['name'], profile['disability_level'])
         
-        return {
-            "success": True,
-            "profile": profile
-        }
+        return Response(content=_PROFILE_RESPONSES[profile["ic_number"]], media_type="application/json")
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ ID lookup error: {str(e)}", exc_info=True)
+        logger.error("❌ ID lookup error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Error looking up ID: {str(e)}"
         )
 
+class VideoFileResponse(FileResponse):
+    """FileResponse with 1 MiB reads (Starlette handles Range / 206 for seeking)"""
+    chunk_size = 1 << 20
+
+BIM_AVATAR_VIDEO_PATH = os.path.join(os.path.dirname(__file__), "godamlah_sign_language_avatar_demo.mp4")
+# The video ships with the deployment, so check for it once instead of per request
+BIM_AVATAR_VIDEO_EXISTS = os.path.exists(BIM_AVATAR_VIDEO_PATH)
+
 @app.get("/video/bim-avatar")
 async def get_bim_avatar_video():
     """
     Serve the BIM Sign Language Avatar video
     """
-    video_path = os.path.join(os.path.dirname(__file__), "godamlah_sign_language_avatar_demo.mp4")
-
-    if not os.path.exists(video_path):
+    if not BIM_AVATAR_VIDEO_EXISTS:
         raise HTTPException(
             status_code=404,
             detail="Video file not found"
         )
 
-    return FileResponse(
-        video_path,
+    return VideoFileResponse(
+        BIM_AVATAR_VIDEO_PATH,
         media_type="video/mp4",
-        filename="godamlah_sign_language_avatar_demo.mp4"
+        filename="godamlah_sign_language_avatar_demo.mp4",
+        # MP4 is already compressed; keep it out of the gzip middleware
+        headers={"Content-Encoding": "identity"}
     )
 
 # ============================================
 # AI FEATURES ENDPOINTS
 # ============================================
 
-def _get_visit_history_objects(user_id: str) -> List[VisitHistory]:
-    """Convert mock visit history dicts to VisitHistory objects"""
-    visits_data = MOCK_VISIT_HISTORY.get(user_id, [])
-    return [VisitHistory(**v) for v in visits_data]
+def _normalize_ic(ic_number: str) -> str:
+    """Canonical IC form for lookups: dashes and spaces removed, upper-cased"""
+    return ic_number.replace("-", "").replace(" ", "").upper()
+
+# Profiles keyed by normalized IC number, built once
+_PROFILES_BY_NORMALIZED_IC: Dict[str, Dict[str, Any]] = {
+    _normalize_ic(ic_number): profile
+    for ic_number, profile in MOCK_USER_PROFILES.items()
+}
+
+# Names used to anonymize generated briefs
+_USER_NAMES: Dict[str, Optional[str]] = {
+    ic_number: profile.get("name")
+    for ic_number, profile in MOCK_USER_PROFILES.items()
+}
+
+# Response bodies for known users, serialized once (mock data never changes)
+_PROFILE_RESPONSES: Dict[str, bytes] = {
+    ic_number: orjson.dumps({"success": True, "profile": profile})
+    for ic_number, profile in MOCK_USER_PROFILES.items()
+}
+_VISIT_HISTORY_RESPONSES: Dict[str, bytes] = {
+    user_id: orjson.dumps({
+        "success": True,
+        "user_id": user_id,
+        "visits": visits_data,
+        "total": len(visits_data)
+    })
+    for user_id, visits_data in MOCK_VISIT_HISTORY.items()
+    if visits_data
+}
+
+# Unknown users get the default user's visits under their own user_id; only the
+# user_id is serialized per request, the rest of the body is spliced from bytes
+_DEFAULT_VISITS = MOCK_VISIT_HISTORY.get("900125-14-0123", [])
+_DEFAULT_VISIT_HISTORY_TAIL = (
+    b',"visits":' + orjson.dumps(_DEFAULT_VISITS) + b',"total":%d}' % len(_DEFAULT_VISITS)
+)
+
+def _default_visit_history_response(user_id: str) -> bytes:
+    """Fallback /visit-history body for a user without records"""
+    return b'{"success":true,"user_id":' + orjson.dumps(user_id) + _DEFAULT_VISIT_HISTORY_TAIL
+
+# Mock data is static, so validate it into Pydantic objects once at import
+# (tuples, so no caller can mutate the shared copies)
+_VISIT_HISTORY_OBJECTS: Dict[str, Tuple[VisitHistory, ...]] = {
+    user_id: tuple(VisitHistory(**v) for v in visits_data)
+    for user_id, visits_data in MOCK_VISIT_HISTORY.items()
+}
+_DEPARTMENTAL_LOG_OBJECTS: Dict[str, Tuple[DepartmentalLog, ...]] = {
+    user_id: tuple(DepartmentalLog(**l) for l in logs_data)
+    for user_id, logs_data in MOCK_DEPARTMENTAL_LOGS.items()
+}
+
+def _get_visit_history_objects(user_id: str) -> Tuple[VisitHistory, ...]:
+    """Get the pre-built VisitHistory objects for a user"""
+    return _VISIT_HISTORY_OBJECTS.get(user_id, ())
+
+def _get_departmental_logs(user_id: str) -> Tuple[DepartmentalLog, ...]:
+    """Get the pre-built DepartmentalLog objects for a user"""
+    return _DEPARTMENTAL_LOG_OBJECTS.get(user_id, ())
+
+def _hour_bucket() -> int:
+    """Current hour since the epoch, used to expire time-of-day dependent cache keys"""
+    return int(time.time() // 3600)
+
+def _prediction_visits(user_id: str) -> Tuple[VisitHistory, ...]:
+    """Visit history used for intent prediction"""
+    # Fallback to default user for demo
+    return _get_visit_history_objects(user_id) or _get_visit_history_objects("900125-14-0123")
 
-def _get_departmental_logs(user_id: str) -> List[DepartmentalLog]:
-    """Convert mock departmental logs to DepartmentalLog objects"""
-    logs_data = MOCK_DEPARTMENTAL_LOGS.get(user_id, [])
-    return [DepartmentalLog(**l) for l in logs_data]
+# Coalesces concurrent intent predictions into one multi-citizen GPT request
+prediction_batcher = PredictionBatcher(
+    prediction_engine,
+    visits_loader=_prediction_visits,
+    window=float(os.getenv("PREDICTION_BATCH_WINDOW_MS", "10")) / 1000
+)
+
+def _not_fallback(result: Any) -> bool:
+    """Cache predicate: keep GPT answers, not rule-based fallbacks after an API error"""
+    return not result.is_fallback
+
+def _prediction_cache_key(user_id: str, current_location: Optional[str]) -> Tuple:
+    """ai_response_cache key for a user's intent prediction"""
+    fingerprint = tuple((v.id, v.status) for v in _prediction_visits(user_id))
+    return ("predict-intent", user_id, current_location, fingerprint, _hour_bucket())
+
+async def _cached_prediction(user_id: str, current_location: Optional[str]) -> PredictionResult:
+    """
+    Intent prediction for a user, memoized per location and hour
+
+    Shared by /predict-intent and /generate-greeting so both reuse one GPT call;
+    cache misses are batched with other users' predictions. The key includes a
+    fingerprint of the visit history, so a changed visit or status misses.
+    """
+    return await ai_response_cache.get_or_set(
+        _prediction_cache_key(user_id, current_location),
+        lambda: prediction_batcher.predict(user_id, current_location),
+        cacheable=_not_fallback
+    )
+
+@lru_cache(maxsize=64)
+def _static_brief_context(
+    user_id: str
+) -> Tuple[Tuple[VisitHistory, ...], Tuple[DepartmentalLog, ...], str]:
+    """
+    Visit history, departmental logs and rendered RAG context for a user
+
+    The records never change at runtime, so the prompt context is formatted
+    once per user; only the location and date are filled in per request.
+    """
+    visits = _get_visit_history_objects(user_id)
+    logs = _get_departmental_logs(user_id)
+
+    if not visits:
+        # Fallback to default user for demo
+        visits = _get_visit_history_objects("900125-14-0123")
+        logs = _get_departmental_logs("900125-14-0123")
+
+    return visits, logs, case_brief_generator.build_rag_context(visits, logs)
+
+async def _cached_brief(user_id: str, current_location: Optional[str]) -> CaseBrief:
+    """Case brief for a user, memoized until their visit history changes"""
+    visits, logs, rag_context = _static_brief_context(user_id)
+
+    # Get user name for anonymization
+    user_name = _USER_NAMES.get(user_id)
+
+    return await ai_response_cache.get_or_set(
+        ("case-brief", user_id, current_location, tuple(v.id for v in visits), len(logs)),
+        lambda: case_brief_generator.generate_brief(
+            user_id=user_id,
+            visits=visits,
+            logs=logs,
+            current_location=current_location,
+            user_name=user_name,
+            rag_context=rag_context
+        ),
+        cacheable=_not_fallback
+    )
 
 
-@app.get("/visit-history/{user_id}")
-async def get_visit_history(user_id: str) -> Dict[str, Any]:
+@app.get("/visit-history/{user_id}", response_model=None)
+async def get_visit_history(user_id: str) -> Response:
     """
     Get visit history for a user
 
@@ -1277,32 +1230,25 @@ async def get_visit_history(user_id: str) -> Dict[str, Any]:
         List of visit history records
     """
     try:
-        logger.info(f"📜 Fetching visit history for: {user_id}")
+        logger.info("📜 Fetching visit history for: %s", user_id)
 
-        # Get visit history (fallback to default user for demo)
-        visits_data = MOCK_VISIT_HISTORY.get(user_id)
-        if not visits_data:
-            logger.warning(f"⚠️ No history for {user_id}, using default")
-            visits_data = MOCK_VISIT_HISTORY.get("900125-14-0123", [])
+        body = _VISIT_HISTORY_RESPONSES.get(user_id)
+        if body is None:
+            # Fallback to default user for demo
+            logger.warning("⚠️ No history for %s, using default", user_id)
+            body = _default_visit_history_response(user_id)
 
-        logger.info(f"✅ Found {len(visits_data)} visits")
-
-        return {
-            "success": True,
-            "user_id": user_id,
-            "visits": visits_data,
-            "total": len(visits_data)
-        }
+        return Response(content=body, media_type="application/json")
 
     except Exception as e:
-        logger.error(f"❌ Visit history error: {str(e)}", exc_info=True)
+        logger.error("❌ Visit history error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Error fetching visit history: {str(e)}"
         )
 
 
-@app.post("/predict-intent")
+@app.post("/predict-intent", response_model=None)
 async def predict_intent(request: PredictIntentRequest) -> Dict[str, Any]:
     """
     Predict user's visit intent based on historical patterns
@@ -1314,22 +1260,12 @@ async def predict_intent(request: PredictIntentRequest) -> Dict[str, Any]:
         Prediction result with intent, confidence, and reasoning
     """
     try:
-        logger.info(f"🔮 Predicting intent for: {request.user_id}")
-
-        # Get visit history
-        visits = _get_visit_history_objects(request.user_id)
-        if not visits:
-            # Fallback to default user for demo
-            visits = _get_visit_history_objects("900125-14-0123")
+        logger.info("🔮 Predicting intent for: %s", request.user_id)
 
-        # Generate prediction
-        prediction = await prediction_engine.predict_intent(
-            user_id=request.user_id,
-            visits=visits,
-            current_location=request.current_location
-        )
+        # Generate prediction (memoized, shared with /generate-greeting)
+        prediction = await _cached_prediction(request.user_id, request.current_location)
 
-        logger.info(f"✅ Prediction: {prediction.predicted_intent} ({prediction.confidence:.0%})")
+        logger.info("✅ Prediction: %s (%.0f%%)", prediction.predicted_intent, prediction.confidence * 100)
 
         return {
             "success": True,
@@ -1337,14 +1273,14 @@ async def predict_intent(request: PredictIntentRequest) -> Dict[str, Any]:
         }
 
     except Exception as e:
-        logger.error(f"❌ Prediction error: {str(e)}", exc_info=True)
+        logger.error("❌ Prediction error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Error predicting intent: {str(e)}"
         )
 
 
-@app.post("/generate-case-brief")
+@app.post("/generate-case-brief", response_model=None)
 async def generate_case_brief(request: GenerateCaseBriefRequest) -> Dict[str, Any]:
     """
     Generate intelligent case brief for officers
@@ -1356,31 +1292,12 @@ async def generate_case_brief(request: GenerateCaseBriefRequest) -> Dict[str, An
         Case brief with narrative, key points, and recommendations
     """
     try:
-        logger.info(f"📋 Generating case brief for: {request.user_id}")
-
-        # Get visit history and departmental logs
-        visits = _get_visit_history_objects(request.user_id)
-        logs = _get_departmental_logs(request.user_id)
-
-        if not visits:
-            # Fallback to default user for demo
-            visits = _get_visit_history_objects("900125-14-0123")
-            logs = _get_departmental_logs("900125-14-0123")
+        logger.info("📋 Generating case brief for: %s", request.user_id)
 
-        # Get user name for anonymization
-        profile = MOCK_USER_PROFILES.get(request.user_id, {})
-        user_name = profile.get("name")
+        # Generate brief (repeat briefs for unchanged visit history are served from cache)
+        brief = await _cached_brief(request.user_id, request.current_location)
 
-        # Generate brief
-        brief = await case_brief_generator.generate_brief(
-            user_id=request.user_id,
-            visits=visits,
-            logs=logs,
-            current_location=request.current_location,
-            user_name=user_name
-        )
-
-        logger.info(f"✅ Brief generated with {len(brief.key_points)} key points")
+        logger.info("✅ Brief generated with %d key points", len(brief.key_points))
 
         return {
             "success": True,
@@ -1388,14 +1305,14 @@ async def generate_case_brief(request: GenerateCaseBriefRequest) -> Dict[str, An
         }
 
     except Exception as e:
-        logger.error(f"❌ Case brief error: {str(e)}", exc_info=True)
+        logger.error("❌ Case brief error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Error generating case brief: {str(e)}"
         )
 
 
-@app.post("/generate-greeting")
+@app.post("/generate-greeting", response_model=None)
 async def generate_greeting(request: GenerateGreetingRequest) -> Dict[str, Any]:
     """
     Generate personalized BIM greeting for avatar chatbot
@@ -1407,31 +1324,37 @@ async def generate_greeting(request: GenerateGreetingRequest) -> Dict[str, Any]:
         Personalized greeting with text and quick actions
     """
     try:
-        logger.info(f"👋 Generating greeting for: {request.user_id}")
+        logger.info("👋 Generating greeting for: %s", request.user_id)
 
         # Get visit history
         visits = _get_visit_history_objects(request.user_id)
         if not visits:
             visits = _get_visit_history_objects("900125-14-0123")
 
-        # Optionally get prediction first
-        prediction = None
-        if request.include_prediction:
-            prediction = await prediction_engine.predict_intent(
+        async def build_greeting():
+            # Optionally get prediction first (reuses a cached /predict-intent result)
+            prediction = None
+            if request.include_prediction:
+                prediction = await _cached_prediction(request.user_id, request.current_location)
+
+            # Generate greeting
+            greeting = await greeting_generator.generate_greeting(
                 user_id=request.user_id,
                 visits=visits,
+                prediction=prediction,
                 current_location=request.current_location
             )
-
-        # Generate greeting
-        greeting = await greeting_generator.generate_greeting(
-            user_id=request.user_id,
-            visits=visits,
-            prediction=prediction,
-            current_location=request.current_location
+            return greeting, prediction
+
+        # Greetings for the same user, location and hour are identical
+        greeting, prediction = await ai_response_cache.get_or_set(
+            ("greeting", request.user_id, request.current_location, request.include_prediction, _hour_bucket()),
+            build_greeting,
+            # Template greetings and fallback predictions are retried on the next request
+            cacheable=lambda pair: pair[0].is_personalized and not (pair[1] and pair[1].is_fallback)
         )
 
-        logger.info(f"✅ Greeting: {greeting.greeting_text[:50]}...")
+        logger.info("✅ Greeting: %.50s...", greeting.greeting_text)
 
         return {
             "success": True,
@@ -1440,13 +1363,76 @@ async def generate_greeting(request: GenerateGreetingRequest) -> Dict[str, Any]:
         }
 
     except Exception as e:
-        logger.error(f"❌ Greeting error: {str(e)}", exc_info=True)
+        logger.error("❌ Greeting error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Error generating greeting: {str(e)}"
         )
 
 
+
+def require_admin_key(x_admin_key: Optional[str] = Header(None)):
+    """Reject requests without the configured X-Admin-Key header"""
+    if not ADMIN_API_KEY:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_API_KEY not set)")
+    if not x_admin_key or not secrets.compare_digest(x_admin_key, ADMIN_API_KEY):
+        raise HTTPException(status_code=401, detail="Invalid or missing X-Admin-Key header")
+
+@app.post("/cache/invalidate/{ic_number}", response_model=None, dependencies=[Depends(require_admin_key)])
+async def invalidate_user_cache(ic_number: str) -> Dict[str, Any]:
+    """
+    Drop cached AI responses for a user (call after their profile or history changes)
+
+    Args:
+        ic_number: User's IC number
+
+    Returns:
+        Number of cache entries removed
+    """
+    removed = ai_response_cache.invalidate(lambda key: key[1] == ic_number)
+    logger.info("🧹 Invalidated %d cached AI response(s) for: %s", removed, ic_number)
+
+    return {
+        "success": True,
+        "ic_number": ic_number,
+        "invalidated": removed
+    }
+
+@app.post("/cache/warm", response_model=None, dependencies=[Depends(require_admin_key)])
+async def warm_prediction_cache(current_location: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Pre-compute intent predictions for every user with visit history
+
+    Run ahead of opening hours so the first /predict-intent and
+    /generate-greeting calls of the day are cache hits. Makes one OpenAI
+    call per batch of users, so it needs the X-Admin-Key header.
+
+    Args:
+        current_location: Service center to predict for (query param)
+
+    Returns:
+        Number of predictions cached
+    """
+    user_ids = list(_VISIT_HISTORY_OBJECTS)
+    logger.info("🔥 Warming intent predictions for %d users", len(user_ids))
+
+    predictions = await prediction_engine.predict_intents_bulk(
+        [(user_id, _prediction_visits(user_id), current_location) for user_id in user_ids]
+    )
+    warmed = 0
+    for user_id, prediction in zip(user_ids, predictions):
+        if _not_fallback(prediction):
+            ai_response_cache.set(_prediction_cache_key(user_id, current_location), prediction)
+            warmed += 1
+
+    return {
+        "success": True,
+        "current_location": current_location,
+        "warmed": warmed,
+        "failed": len(predictions) - warmed
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
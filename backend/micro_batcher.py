@@ -0,0 +1,144 @@
+"""
+Micro-batching base class for SmartSign
+Coalesces concurrent requests that arrive within a short window into one batched call
+"""
+
+import asyncio
+import logging
+from typing import Dict, Generic, Hashable, List, Optional, Set, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class MicroBatcher(Generic[K, V]):
+    """
+    Buffers requests that arrive within a short window, processes them as one
+    batch, then scatters the results back to each waiting caller.
+
+    Subclasses implement _process_one (single request) and _process_many
+    (several distinct requests in one call). Identical keys in the same window
+    share one result; a failed batch is split in half and retried, and keys
+    missing from a batch result are retried on their own.
+    """
+
+    name = "Batcher"
+
+    def __init__(self, window: float = 0.03, max_batch_size: int = 16):
+        self.window = window  # Seconds to wait for more requests after the first arrives
+        self.max_batch_size = max_batch_size
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+    def start(self):
+        """Start the background worker (call from the running event loop)"""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+            logger.info(f"✅ {self.name} started (window={self.window * 1000:.0f}ms)")
+
+    async def stop(self):
+        """Stop the worker and fail any requests still waiting in the queue"""
+        if self._worker is None:
+            return
+
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError(f"{self.name} stopped"))
+
+    async def submit(self, key: K) -> V:
+        """
+        Queue a request and wait for its result
+
+        Args:
+            key: Hashable request description
+
+        Returns:
+            Result for this key
+        """
+        if self._worker is None:
+            # Batching not running (e.g. standalone scripts) - call directly
+            return await self._process_one(key)
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((key, future))
+        return await future
+
+    async def _run(self):
+        """Collect requests into batches and dispatch them"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Dispatch without blocking collection of the next batch
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[K, asyncio.Future]]):
+        """Process a batch and resolve each caller's future"""
+        # Identical keys in the same window share one result
+        keys = list(dict.fromkeys(key for key, _ in batch))
+
+        try:
+            if len(keys) == 1:
+                results = {keys[0]: await self._process_one(keys[0])}
+            else:
+                results = await self._process_many(keys)
+        except Exception as e:
+            if len(keys) > 1:
+                # Split the batch so one bad response doesn't fail every caller
+                logger.warning(f"⚠️ {self.name}: batch of {len(keys)} failed ({str(e)}), splitting")
+                mid = len(keys) // 2
+                first = set(keys[:mid])
+                await asyncio.gather(
+                    self._dispatch([item for item in batch if item[0] in first]),
+                    self._dispatch([item for item in batch if item[0] not in first]),
+                )
+                return
+
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        missing = [item for item in batch if item[0] not in results]
+        for key, future in batch:
+            if key in results and not future.done():
+                future.set_result(results[key])
+
+        if missing:
+            # Retry keys the batched call didn't answer
+            logger.warning(f"⚠️ {self.name}: {len(missing)} result(s) missing from batch response, retrying")
+            await self._dispatch(missing)
+
+    async def _process_one(self, key: K) -> V:
+        """Handle a single request"""
+        raise NotImplementedError
+
+    async def _process_many(self, keys: List[K]) -> Dict[K, V]:
+        """Handle several distinct requests in one call; may omit keys it couldn't answer"""
+        raise NotImplementedError
@@ -6,7 +6,8 @@ Pydantic models for SmartSign AI Features:
 - Personalized Greeting
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
+from functools import cached_property
 from typing import List, Optional
 from datetime import datetime
 from enum import Enum
@@ -24,7 +25,7 @@ class VisitHistory(BaseModel):
     user_id: str  # IC number
     location: str  # e.g., "Immigration", "JPJ", "JPN"
     department: str  # Full department name
-    datetime: str  # ISO format datetime
+    datetime: datetime  # Parsed once from the ISO string at construction
     application: str  # e.g., "Passport Renewal", "Driving License"
     queue: Optional[str] = None  # Queue number
     status: VisitStatus
@@ -37,6 +38,12 @@ class VisitHistory(BaseModel):
     follow_up_date: Optional[str] = None
     preferred_language: str = "BIM"
 
+    @computed_field
+    @cached_property
+    def epoch(self) -> int:
+        """Visit time as Unix seconds, for cheap integer sorting/recency checks"""
+        return int(self.datetime.timestamp())
+
 
 class AlternativeIntent(BaseModel):
     """Alternative predicted intent with lower confidence"""
@@ -52,6 +59,7 @@ class PredictionResult(BaseModel):
     display_text: str  # e.g., "Likely purpose: Renewal of OKU benefits (92% confidence)"
     alternative_intents: List[AlternativeIntent] = Field(default_factory=list)
     supporting_visits: List[str] = Field(default_factory=list)  # Visit IDs
+    is_fallback: bool = False  # Rule-based answer (GPT unavailable or failed); never cached
 
 
 class DepartmentalLog(BaseModel):
@@ -73,6 +81,7 @@ class CaseBrief(BaseModel):
     context_sources: List[str] = Field(default_factory=list)
     generated_at: str
     privacy_verified: bool = True
+    is_fallback: bool = False  # Rule-based brief (GPT unavailable or failed); never cached
 
 
 class PersonalizedGreeting(BaseModel):
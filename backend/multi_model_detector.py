@@ -2,25 +2,76 @@
 Multi-Model Sign Language Detector with Bounding Box Visualization
 Tests multiple Roboflow models and returns all predictions with bounding boxes
 """
+import asyncio
+import hashlib
 import cv2
+import httpx
 import numpy as np
 from inference_sdk import InferenceHTTPClient
 from typing import Dict, Any, List, Tuple, Optional
 import os
-import base64
 import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from functools import lru_cache
+
+from async_cache import AsyncLRUCache
+from image_codec import JPEG_MAGIC, decode_image, encode_jpeg
+from onnx_detector import load_local_detector
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ROBOFLOW_API_URL = "https://detect.roboflow.com"
+
+# cv2.dnn.NMSBoxesBatched (class-aware NMS in one call) needs OpenCV 4.7+
+_HAS_BATCHED_NMS = hasattr(cv2.dnn, "NMSBoxesBatched")
+
+# Column layout for a model's predictions (see MultiModelDetector._prediction_table)
+PREDICTION_DTYPE = np.dtype([
+    ("x", np.float32),
+    ("y", np.float32),
+    ("width", np.float32),
+    ("height", np.float32),
+    ("confidence", np.float64),
+    ("class_id", np.int32),
+])
+
+def _confidence(prediction: Dict) -> float:
+    """Sort key: a prediction's confidence"""
+    return prediction.get("confidence", 0)
+
+@lru_cache(maxsize=1024)
+def _label_size(label: str) -> Tuple[int, int]:
+    """Rendered (width, height) of a bbox label; labels repeat across frames"""
+    (width, height), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+    return width, height
+
 class MultiModelDetector:
-    def __init__(self, roboflow_api_key: str = None):
-        """Initialize multi-model detector with multiple Roboflow models"""
-        self.api_key = roboflow_api_key or os.getenv("ROBOFLOW_API_KEY", "PfNLBY9FSfXGfx9lccYk")
+    # Roboflow's hosted API allows ~20 concurrent requests per key
+    MAX_CONCURRENT_REQUESTS = 20
+    # The models take 640x640 input; larger uploads are shrunk before sending
+    MAX_INPUT_SIDE = 640
+    
+    def __init__(self, roboflow_api_key: str = None, process_workers: Optional[int] = None):
+        """
+        Initialize multi-model detector with multiple Roboflow models
+        
+        Args:
+            roboflow_api_key: Roboflow API key (defaults to ROBOFLOW_API_KEY)
+            process_workers: Worker processes for annotation rendering
+                (defaults to MULTI_MODEL_PROCESS_WORKERS; 0 renders in threads,
+                -1 marks a render worker, which skips the ONNX model)
+        """
+        self.api_key = roboflow_api_key or os.getenv("ROBOFLOW_API_KEY")
+        if not self.api_key:
+            raise ValueError("ROBOFLOW_API_KEY is not set; add it to backend/.env (run setup_env.py)")
         
         # Initialize Roboflow client
         self.roboflow_client = InferenceHTTPClient(
-            api_url="https://detect.roboflow.com",
+            api_url=ROBOFLOW_API_URL,
             api_key=self.api_key
         )
         
@@ -33,12 +84,53 @@ class MultiModelDetector:
             }
         }
         
+        # Optional on-device model (BIM_ONNX_MODEL) standing in for one Roboflow model;
+        # the hosted API stays the fallback if it's missing or fails
+        self.local_detector = load_local_detector() if process_workers != -1 else None
+        self.local_model_id = os.getenv("BIM_ONNX_MODEL_ID", "bim-recognition-x7qsz/10")
+        
+        # Created lazily inside the running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        
+        # Fan-out pool for the sync path, created on first multi-model call
+        self._pool: Optional[ThreadPoolExecutor] = None
+        
+        # Optional worker processes for the draw + encode stage, so it doesn't share
+        # the server's GIL; frames are handed over through shared memory
+        if process_workers is None:
+            process_workers = int(os.getenv("MULTI_MODEL_PROCESS_WORKERS", "0"))
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        if process_workers > 0:
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=process_workers,
+                # spawn: never fork a server process that is running threads
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_render_worker
+            )
+            logger.info(f"✅ Annotation rendering in {process_workers} worker processes")
+        
+        # Per-thread annotation canvas, reused across calls of the same frame size
+        self._tls = threading.local()
+        
+        # Roboflow predictions keyed by (model_id, image digest): repeated frames
+        # (idle camera streams, retries) skip the HTTP round trip entirely.
+        # Cached prediction lists are shared between callers - treat as read-only.
+        self.prediction_cache = AsyncLRUCache(maxsize=int(os.getenv("ROBOFLOW_CACHE_SIZE", "256")))
+        
         logger.info(f"✅ Multi-model detector initialized with {len(self.models)} models")
     
-    def detect_all_models(self, image_data: bytes) -> Dict[str, Any]:
+    def detect_all_models(self, image_data: bytes, render: bool = True, sort: bool = False) -> Dict[str, Any]:
         """
         Run detection on all models and return predictions with bounding boxes
         
+        Args:
+            image_data: Encoded image bytes
+            render: Draw the boxes and return an annotated JPEG; False skips
+                the copy, drawing and encode and returns annotated_image None
+            sort: Return each model's predictions sorted by confidence
+                (best_prediction is always the top one either way)
+        
         Returns:
             {
                 "success": bool,
@@ -50,125 +142,443 @@ class MultiModelDetector:
                     }
                 },
                 "best_overall": {...},
-                "annotated_image": base64_string
+                "annotated_image": JPEG bytes (None when render is False)
             }
         """
         try:
             # Decode image
-            nparr = np.frombuffer(image_data, np.uint8)
-            image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            prepared = self._prepare_image(image_data)
             
-            if image is None:
+            if prepared is None:
                 return {"success": False, "error": "Could not decode image"}
             
-            # Create a copy for annotation
-            annotated_image = image.copy()
+            image, upload, scale = prepared
             
-            results = {}
-            all_predictions = []
+            def run(model_id: str) -> List[Dict]:
+                predictions = self._infer_local(model_id, image)
+                if predictions is None:
+                    predictions = self._unscale(self._infer_one(model_id, upload), scale)
+                return predictions
             
-            # Run inference on all models
-            for model_name, model_info in self.models.items():
-                model_id = model_info["model_id"]
-                color = model_info["color"]
-                
+            # Run inference on all models (independent I/O, so concurrently when there are several)
+            model_ids = [model_info["model_id"] for model_info in self.models.values()]
+            if len(model_ids) > 1:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=min(len(model_ids), self.MAX_CONCURRENT_REQUESTS),
+                        thread_name_prefix="multi-model"
+                    )
+                futures = [self._pool.submit(run, model_id) for model_id in model_ids]
+            else:
+                futures = None
+            
+            outcomes = []
+            for index, model_id in enumerate(model_ids):
                 try:
-                    # Run inference
-                    result = self.roboflow_client.infer(image_data, model_id=model_id)
-                    
-                    predictions = result.get("predictions", [])
-                    
-                    if predictions:
-                        # Sort by confidence
-                        sorted_predictions = sorted(predictions, key=lambda x: x.get("confidence", 0), reverse=True)
-                        best_prediction = sorted_predictions[0]
-                        
-                        # Draw bounding boxes on annotated image
-                        for pred in predictions:
-                            self._draw_bbox(annotated_image, pred, model_name, color)
-                        
-                        results[model_name] = {
-                            "model_id": model_id,
-                            "predictions": sorted_predictions,
-                            "best_prediction": {
-                                "class": best_prediction.get("class", "unknown"),
-                                "confidence": best_prediction.get("confidence", 0.0),
-                                "x": best_prediction.get("x", 0),
-                                "y": best_prediction.get("y", 0),
-                                "width": best_prediction.get("width", 0),
-                                "height": best_prediction.get("height", 0)
-                            },
-                            "bbox_count": len(predictions),
-                            "color": color
-                        }
-                        
-                        all_predictions.append({
-                            "model": model_name,
-                            "prediction": best_prediction,
-                            "confidence": best_prediction.get("confidence", 0)
-                        })
-                        
-                        logger.info(f"✅ {model_name}: {best_prediction.get('class')} ({best_prediction.get('confidence', 0):.2%})")
-                    else:
-                        results[model_name] = {
-                            "model_id": model_id,
-                            "predictions": [],
-                            "best_prediction": None,
-                            "bbox_count": 0,
-                            "color": color
-                        }
-                        logger.info(f"⚠️  {model_name}: No predictions")
-                        
+                    outcomes.append(futures[index].result() if futures else run(model_id))
                 except Exception as e:
-                    logger.error(f"❌ {model_name} error: {str(e)}")
-                    results[model_name] = {
-                        "model_id": model_id,
-                        "error": str(e),
-                        "predictions": [],
-                        "best_prediction": None,
-                        "bbox_count": 0,
-                        "color": color
-                    }
+                    outcomes.append(e)
             
-            # Find best overall prediction
-            best_overall = None
-            if all_predictions:
-                best_overall = max(all_predictions, key=lambda x: x["confidence"])
-            
-            # Encode annotated image to base64
-            _, buffer = cv2.imencode('.jpg', annotated_image)
-            annotated_base64 = base64.b64encode(buffer).decode('utf-8')
-            
-            return {
-                "success": True,
-                "models": results,
-                "best_overall": best_overall,
-                "annotated_image": f"data:image/jpeg;base64,{annotated_base64}",
-                "total_models": len(self.models),
-                "models_with_detections": len([r for r in results.values() if r.get("bbox_count", 0) > 0])
-            }
+            return self._build_result(image, outcomes, render, sort)
             
         except Exception as e:
             logger.error(f"❌ Multi-model detection error: {str(e)}")
             return {"success": False, "error": str(e)}
     
-    def _draw_bbox(self, image: np.ndarray, prediction: Dict, model_name: str, color: Tuple[int, int, int]):
-        """Draw bounding box on image"""
+    async def detect_all_models_async(
+        self,
+        image_data: bytes,
+        render: bool = True,
+        sort: bool = False,
+        image: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
+        """
+        Same as detect_all_models, but queries every model concurrently
+        
+        Total latency is roughly the slowest model instead of the sum of all
+        models; at most MAX_CONCURRENT_REQUESTS calls are in flight at once.
+        Identical images are answered from self.prediction_cache. Pass image
+        (the full-size decode of image_data) to skip decoding it again.
+        
+        The result also carries "image_digest", the hex content hash of
+        image_data, for callers that key their own caches by the image.
+        """
         try:
-            # Get bounding box coordinates
-            x = int(prediction.get("x", 0))
-            y = int(prediction.get("y", 0))
-            width = int(prediction.get("width", 0))
-            height = int(prediction.get("height", 0))
+            # Decode (and shrink) off the event loop
+            prepared = await asyncio.to_thread(self._prepare_image, image_data, image)
+            
+            if prepared is None:
+                return {"success": False, "error": "Could not decode image"}
+            
+            image, upload, scale = prepared
             
-            # Calculate top-left and bottom-right corners
-            x1 = int(x - width / 2)
-            y1 = int(y - height / 2)
-            x2 = int(x + width / 2)
-            y2 = int(y + height / 2)
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+            
+            # Content hash, computed once for all models
+            digest = hashlib.blake2b(image_data, digest_size=16).digest()
+            
+            async def submit(model_id: str) -> List[Dict]:
+                if self.local_detector is not None and model_id == self.local_model_id:
+                    predictions = await asyncio.to_thread(self._infer_local, model_id, image)
+                    if predictions is not None:
+                        return predictions
+                
+                async with self._semaphore:
+                    predictions = await self._infer_one_async(model_id, upload)
+                return self._unscale(predictions, scale)
             
-            # Draw rectangle
-            cv2.rectangle(image, (x1, y1), (x2, y2), color, 2)
+            async def infer(model_id: str) -> List[Dict]:
+                return await self.prediction_cache.get_or_set(
+                    (model_id, digest), lambda: submit(model_id)
+                )
+            
+            outcomes = await asyncio.gather(
+                *(infer(model_info["model_id"]) for model_info in self.models.values()),
+                return_exceptions=True
+            )
+            
+            if render and self._process_pool is not None:
+                result = await self._build_result_in_process(image, outcomes, sort)
+            else:
+                result = await asyncio.to_thread(self._build_result, image, outcomes, render, sort)
+            
+            result["image_digest"] = digest.hex()
+            return result
+            
+        except Exception as e:
+            logger.error(f"❌ Multi-model detection error: {str(e)}")
+            return {"success": False, "error": str(e)}
+    
+    def _prepare_image(self, image_data: bytes, image: Optional[np.ndarray] = None) -> Optional[Tuple[np.ndarray, bytes, float]]:
+        """
+        Decode an upload and shrink it to the models' input size for sending
+        
+        Args:
+            image_data: Encoded upload
+            image: image_data already decoded to BGR, if the caller has it
+        
+        Returns:
+            (full-size BGR image, bytes to send to Roboflow, scale applied), or
+            None if the image could not be decoded
+        """
+        if image is None:
+            image = decode_image(image_data)
+        if image is None:
+            return None
+        
+        height, width = image.shape[:2]
+        longest = max(height, width)
+        if longest <= self.MAX_INPUT_SIDE:
+            # Roboflow gets the upload as image/jpeg, so PNG/WebP are re-encoded
+            if image_data.startswith(JPEG_MAGIC):
+                return image, image_data, 1.0
+            return image, encode_jpeg(image, quality=80), 1.0
+        
+        scale = self.MAX_INPUT_SIDE / longest
+        small = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return image, encode_jpeg(small, quality=80), scale
+    
+    @staticmethod
+    def _unscale(predictions: List[Dict], scale: float) -> List[Dict]:
+        """Map predictions made on the shrunken upload back to full-size coordinates"""
+        if scale == 1.0:
+            return predictions
+        
+        return [
+            {
+                **pred,
+                "x": pred.get("x", 0) / scale,
+                "y": pred.get("y", 0) / scale,
+                "width": pred.get("width", 0) / scale,
+                "height": pred.get("height", 0) / scale,
+            }
+            for pred in predictions
+        ]
+    
+    def _infer_local(self, model_id: str, image: np.ndarray) -> Optional[List[Dict]]:
+        """Predictions from the on-device model, or None to fall back to Roboflow"""
+        if self.local_detector is None or model_id != self.local_model_id:
+            return None
+        
+        try:
+            return self.local_detector.predict(image)
+        except Exception as e:
+            logger.error(f"❌ Local ONNX inference failed, falling back to Roboflow: {str(e)}")
+            return None
+    
+    def _infer_one(self, model_id: str, image_data: bytes) -> List[Dict]:
+        """Run a single Roboflow model and return its raw predictions"""
+        result = self.roboflow_client.infer(image_data, model_id=model_id)
+        return result.get("predictions", [])
+    
+    async def _infer_one_async(self, model_id: str, image_data: bytes) -> List[Dict]:
+        """
+        Async _infer_one over a persistent HTTP/2 connection pool
+        
+        The SDK opens a fresh connection per call; this reuses one keep-alive
+        session for every request, skipping the TCP + TLS handshake.
+        """
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=ROBOFLOW_API_URL,
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=self.MAX_CONCURRENT_REQUESTS,
+                    max_keepalive_connections=self.MAX_CONCURRENT_REQUESTS,
+                    keepalive_expiry=60
+                ),
+                timeout=30
+            )
+        
+        response = await self._http.post(
+            f"/{model_id}",
+            params={"api_key": self.api_key},
+            # Raw JPEG as multipart: no base64 pass and ~25% fewer bytes on the wire
+            files={"file": ("image.jpg", image_data, "image/jpeg")}
+        )
+        response.raise_for_status()
+        return response.json().get("predictions", [])
+    
+    async def aclose(self):
+        """Close the pooled HTTP connections and worker processes"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+    
+    async def _build_result_in_process(self, image: np.ndarray, outcomes: List[Any], sort: bool) -> Dict[str, Any]:
+        """
+        Run _build_result (with rendering) in a worker process
+        
+        The decoded frame is copied once into a shared-memory block that the
+        worker maps without copying; only the predictions and the encoded JPEG
+        are pickled.
+        """
+        shm = shared_memory.SharedMemory(create=True, size=image.nbytes)
+        try:
+            view = np.ndarray(image.shape, dtype=image.dtype, buffer=shm.buf)
+            view[...] = image
+            del view  # Release the buffer export before close()
+            
+            # Exceptions (e.g. httpx errors) may not pickle; _build_result only needs the message
+            outcomes = [RuntimeError(str(o)) if isinstance(o, BaseException) else o for o in outcomes]
+            
+            return await asyncio.get_running_loop().run_in_executor(
+                self._process_pool,
+                _build_result_in_worker,
+                shm.name, image.shape, image.dtype.str, outcomes, sort
+            )
+        finally:
+            shm.close()
+            shm.unlink()
+    
+    def _build_result(
+        self,
+        image: np.ndarray,
+        outcomes: List[Any],
+        render: bool = True,
+        sort: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Aggregate per-model outcomes into the detect_all_models response
+        
+        Args:
+            image: Decoded BGR image to annotate
+            outcomes: Predictions list (or the raised exception) per model, in self.models order
+            render: Whether to draw the boxes and encode the annotated image
+            sort: Whether to sort each model's predictions by confidence
+        """
+        # Copy into a reusable canvas for annotation (only the encoded bytes leave this call)
+        annotated_image = self._annotation_canvas(image) if render else None
+        
+        results = {}
+        all_predictions = []
+        
+        for (model_name, model_info), outcome in zip(self.models.items(), outcomes):
+            model_id = model_info["model_id"]
+            color = model_info["color"]
+            
+            if isinstance(outcome, BaseException):
+                logger.error(f"❌ {model_name} error: {str(outcome)}")
+                results[model_name] = {
+                    "model_id": model_id,
+                    "error": str(outcome),
+                    "predictions": [],
+                    "best_prediction": None,
+                    "bbox_count": 0,
+                    "color": color
+                }
+                continue
+            
+            predictions = outcome
+            
+            if predictions:
+                # Column view of the predictions, shared by the argmax, corners and NMS
+                table = self._prediction_table(predictions)
+                
+                # Only the top prediction is needed; a full sort is opt-in
+                best_prediction = predictions[int(table["confidence"].argmax())]
+                
+                # Draw bounding boxes on annotated image
+                if render:
+                    # Draw only one box per cluster of overlapping same-class detections
+                    corners = self._bbox_corners(table)
+                    for i in self._nms_keep(table, corners):
+                        self._draw_bbox(annotated_image, corners[i], predictions[i], model_name, color)
+                
+                results[model_name] = {
+                    "model_id": model_id,
+                    "predictions": sorted(predictions, key=_confidence, reverse=True) if sort else predictions,
+                    "best_prediction": {
+                        "class": best_prediction.get("class", "unknown"),
+                        "confidence": best_prediction.get("confidence", 0.0),
+                        "x": best_prediction.get("x", 0),
+                        "y": best_prediction.get("y", 0),
+                        "width": best_prediction.get("width", 0),
+                        "height": best_prediction.get("height", 0)
+                    },
+                    "bbox_count": len(predictions),
+                    "color": color
+                }
+                
+                all_predictions.append({
+                    "model": model_name,
+                    "prediction": best_prediction,
+                    "confidence": best_prediction.get("confidence", 0)
+                })
+                
+                logger.info(f"✅ {model_name}: {best_prediction.get('class')} ({best_prediction.get('confidence', 0):.2%})")
+            else:
+                results[model_name] = {
+                    "model_id": model_id,
+                    "predictions": [],
+                    "best_prediction": None,
+                    "bbox_count": 0,
+                    "color": color
+                }
+                logger.info(f"⚠️  {model_name}: No predictions")
+        
+        # Find best overall prediction
+        best_overall = None
+        if all_predictions:
+            best_overall = max(all_predictions, key=lambda x: x["confidence"])
+        
+        # Encode annotated image (raw JPEG bytes; callers serve it as an image, not inline JSON)
+        annotated_jpeg = encode_jpeg(annotated_image, quality=85) if render else None
+        
+        return {
+            "success": True,
+            "models": results,
+            "best_overall": best_overall,
+            "annotated_image": annotated_jpeg,
+            "total_models": len(self.models),
+            "models_with_detections": len([r for r in results.values() if r.get("bbox_count", 0) > 0])
+        }
+    
+    def _annotation_canvas(self, image: np.ndarray) -> np.ndarray:
+        """Copy image into this thread's reusable buffer, reallocating only on size change"""
+        canvas = getattr(self._tls, "canvas", None)
+        if canvas is None or canvas.shape != image.shape or canvas.dtype != image.dtype:
+            canvas = np.empty_like(image)
+            self._tls.canvas = canvas
+        np.copyto(canvas, image)
+        return canvas
+    
+    # Overlap above which a lower-confidence box of the same class isn't drawn
+    NMS_IOU_THRESHOLD = 0.45
+    
+    @staticmethod
+    def _prediction_table(predictions: List[Dict]) -> np.ndarray:
+        """
+        Pack prediction dicts into a PREDICTION_DTYPE structured array in one pass
+        
+        Classes are numbered in order of first appearance (per call).
+        """
+        class_ids: Dict[str, int] = {}
+        return np.fromiter(
+            (
+                (
+                    p.get("x", 0), p.get("y", 0), p.get("width", 0), p.get("height", 0),
+                    p.get("confidence", 0),
+                    class_ids.setdefault(p.get("class", "unknown"), len(class_ids))
+                )
+                for p in predictions
+            ),
+            dtype=PREDICTION_DTYPE,
+            count=len(predictions)
+        )
+    
+    @classmethod
+    def _nms_keep(cls, table: np.ndarray, corners: np.ndarray) -> List[int]:
+        """
+        Class-aware non-maximum suppression over all predictions at once
+        
+        Returns:
+            Indices of the predictions to draw, highest confidence first
+        """
+        if len(table) < 2:
+            return list(range(len(table)))
+        
+        boxes = np.column_stack((corners[:, :2], corners[:, 2:] - corners[:, :2])).tolist()
+        if _HAS_BATCHED_NMS:
+            keep = cv2.dnn.NMSBoxesBatched(
+                boxes, table["confidence"].tolist(), table["class_id"].tolist(), 0.0, cls.NMS_IOU_THRESHOLD
+            )
+            return np.asarray(keep, dtype=np.int64).flatten().tolist()
+        
+        # OpenCV < 4.7: run NMSBoxes per class and merge
+        confidences = table["confidence"]
+        keep = []
+        for class_id in np.unique(table["class_id"]):
+            members = np.flatnonzero(table["class_id"] == class_id)
+            kept = cv2.dnn.NMSBoxes(
+                [boxes[i] for i in members], confidences[members].tolist(), 0.0, cls.NMS_IOU_THRESHOLD
+            )
+            keep.extend(members[np.asarray(kept, dtype=np.int64).flatten()].tolist())
+        keep.sort(key=lambda i: confidences[i], reverse=True)
+        return keep
+    
+    @staticmethod
+    def _bbox_corners(table: np.ndarray) -> np.ndarray:
+        """
+        Convert center-format boxes to (x1, y1, x2, y2) corners in one pass
+        
+        Returns:
+            int32 array of shape (len(table), 4)
+        """
+        half_w = table["width"] / 2
+        half_h = table["height"] / 2
+        return np.column_stack((
+            table["x"] - half_w, table["y"] - half_h, table["x"] + half_w, table["y"] + half_h
+        )).astype(np.int32)
+    
+    @staticmethod
+    def _fill(image: np.ndarray, x1: int, y1: int, x2: int, y2: int, color: Tuple[int, int, int]):
+        """Paint image[y1:y2, x1:x2], clipped to the image, with a solid color"""
+        height, width = image.shape[:2]
+        x1, x2 = max(x1, 0), min(x2, width)
+        y1, y2 = max(y1, 0), min(y2, height)
+        if x1 < x2 and y1 < y2:
+            image[y1:y2, x1:x2] = color
+    
+    def _draw_bbox(self, image: np.ndarray, corners: np.ndarray, prediction: Dict, model_name: str, color: Tuple[int, int, int]):
+        """
+        Draw bounding box on image
+        
+        The 2px border and the label background are axis-aligned, so they are
+        painted with NumPy slice assignments; only the text needs OpenCV.
+        """
+        try:
+            x1, y1, x2, y2 = corners.tolist()
+            
+            # Draw rectangle (2px edges, centered on the box outline like cv2.rectangle)
+            self._fill(image, x1 - 1, y1 - 1, x2 + 1, y1 + 1, color)
+            self._fill(image, x1 - 1, y2 - 1, x2 + 1, y2 + 1, color)
+            self._fill(image, x1 - 1, y1 - 1, x1 + 1, y2 + 1, color)
+            self._fill(image, x2 - 1, y1 - 1, x2 + 1, y2 + 1, color)
             
             # Prepare label
             class_name = prediction.get("class", "unknown")
@@ -176,8 +586,8 @@ class MultiModelDetector:
             label = f"{model_name[:10]}: {class_name} {confidence:.0%}"
             
             # Draw label background
-            (label_width, label_height), baseline = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
-            cv2.rectangle(image, (x1, y1 - label_height - 10), (x1 + label_width, y1), color, -1)
+            label_width, label_height = _label_size(label)
+            self._fill(image, x1, y1 - label_height - 10, x1 + label_width + 1, y1 + 1, color)
             
             # Draw label text
             cv2.putText(image, label, (x1, y1 - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
@@ -199,3 +609,29 @@ class MultiModelDetector:
             }
         }
 
+
+# Worker-process side of MultiModelDetector._build_result_in_process
+_render_detector: Optional[MultiModelDetector] = None
+
+def _init_render_worker():
+    """Build the per-process detector used for rendering (no ONNX model, no nested pool)"""
+    global _render_detector
+    _render_detector = MultiModelDetector(process_workers=-1)
+
+def _build_result_in_worker(
+    shm_name: str,
+    shape: Tuple[int, ...],
+    dtype: str,
+    outcomes: List[Any],
+    sort: bool
+) -> Dict[str, Any]:
+    """Map the shared frame and build the annotated result"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        image = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        # _build_result copies the frame into its canvas, so nothing keeps the mapping
+        result = _render_detector._build_result(image, outcomes, True, sort)
+        del image
+        return result
+    finally:
+        shm.close()
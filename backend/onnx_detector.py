@@ -0,0 +1,164 @@
+"""
+Local ONNX Runtime inference for SmartSign
+Runs an exported YOLOv8 BIM model on-device instead of calling detect.roboflow.com
+"""
+
+import ast
+import logging
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+# Preferred execution providers, fastest first; unavailable ones are skipped
+DEFAULT_PROVIDERS = ("TensorrtExecutionProvider", "CUDAExecutionProvider", "CPUExecutionProvider")
+
+
+def letterbox(image: np.ndarray, size: int = 640) -> Tuple[np.ndarray, float]:
+    """
+    Scale a BGR image's longest side to size, pad to a square and convert to a model blob
+
+    Returns:
+        (float32 NCHW RGB blob in [0, 1], scale applied to the image)
+    """
+    height, width = image.shape[:2]
+    scale = size / max(height, width)
+    resized = cv2.resize(image, (round(width * scale), round(height * scale)), interpolation=cv2.INTER_AREA)
+    canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+    canvas[:resized.shape[0], :resized.shape[1]] = resized
+
+    return cv2.dnn.blobFromImage(canvas, 1 / 255.0, swapRB=True), scale
+
+
+class OnnxSignDetector:
+    """
+    YOLOv8-style detector running through ONNX Runtime.
+
+    Returns predictions in the same shape as Roboflow's hosted API
+    (center x/y, width, height, confidence, class, class_id) in the
+    coordinates of the image passed in.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        confidence_threshold: float = 0.4,
+        iou_threshold: float = 0.5,
+        providers: Sequence[str] = DEFAULT_PROVIDERS,
+    ):
+        available = set(ort.get_available_providers())
+        self.session = ort.InferenceSession(
+            model_path,
+            providers=[p for p in providers if p in available]
+        )
+        self.confidence_threshold = confidence_threshold
+        self.iou_threshold = iou_threshold
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.input_size = int(model_input.shape[2]) if isinstance(model_input.shape[2], int) else 640
+        self.class_names = self._read_class_names()
+
+        logger.info(
+            f"✅ ONNX model loaded: {os.path.basename(model_path)} "
+            f"({len(self.class_names)} classes, {self.session.get_providers()[0]})"
+        )
+
+    def _read_class_names(self) -> Dict[int, str]:
+        """Class names from the Ultralytics export metadata ("{0: 'help', ...}")"""
+        names = self.session.get_modelmeta().custom_metadata_map.get("names")
+        if not names:
+            return {}
+        try:
+            return {int(k): str(v) for k, v in ast.literal_eval(names).items()}
+        except (ValueError, SyntaxError):
+            logger.warning("⚠️ Could not parse class names from ONNX metadata")
+            return {}
+
+    def predict(self, image: np.ndarray) -> List[Dict]:
+        """
+        Detect signs in a BGR image
+
+        Args:
+            image: BGR image of any size
+
+        Returns:
+            Roboflow-style prediction dicts, highest confidence first
+        """
+        blob, scale = letterbox(image, self.input_size)
+        output = self.session.run(None, {self.input_name: blob})[0]
+
+        # YOLOv8 output: (1, 4 + num_classes, num_anchors) -> (num_anchors, 4 + num_classes)
+        rows = output[0].T
+        class_scores = rows[:, 4:]
+        class_ids = class_scores.argmax(axis=1)
+        confidences = class_scores[np.arange(len(rows)), class_ids]
+
+        keep = confidences >= self.confidence_threshold
+        if not keep.any():
+            return []
+
+        boxes = rows[keep, :4] / scale  # cx, cy, w, h in original pixels
+        confidences = confidences[keep]
+        class_ids = class_ids[keep]
+
+        # NMSBoxes wants top-left x/y
+        corners = boxes.copy()
+        corners[:, :2] -= corners[:, 2:] / 2
+        indices = cv2.dnn.NMSBoxes(
+            corners.tolist(), confidences.tolist(), self.confidence_threshold, self.iou_threshold
+        )
+
+        predictions = []
+        for i in np.array(indices).flatten():
+            cx, cy, w, h = boxes[i].tolist()
+            class_id = int(class_ids[i])
+            predictions.append({
+                "x": cx,
+                "y": cy,
+                "width": w,
+                "height": h,
+                "confidence": float(confidences[i]),
+                "class": self.class_names.get(class_id, str(class_id)),
+                "class_id": class_id,
+            })
+
+        predictions.sort(key=lambda p: p["confidence"], reverse=True)
+        return predictions
+
+
+def load_local_detector(model_path: Optional[str] = None) -> Optional[OnnxSignDetector]:
+    """
+    Load the local ONNX model if configured
+
+    Args:
+        model_path: Path to the .onnx file (defaults to the BIM_ONNX_MODEL env var)
+
+    Returns:
+        OnnxSignDetector, or None when onnxruntime or the model file is unavailable
+    """
+    model_path = model_path or os.getenv("BIM_ONNX_MODEL")
+    if not model_path:
+        return None
+
+    if ort is None:
+        logger.warning("⚠️ BIM_ONNX_MODEL is set but onnxruntime is not installed; using Roboflow API")
+        return None
+
+    if not os.path.exists(model_path):
+        logger.warning(f"⚠️ ONNX model not found at {model_path}; using Roboflow API")
+        return None
+
+    try:
+        return OnnxSignDetector(model_path)
+    except Exception as e:
+        logger.error(f"❌ Failed to load ONNX model: {str(e)}; using Roboflow API")
+        return None
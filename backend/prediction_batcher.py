@@ -0,0 +1,66 @@
+"""
+Prediction batcher for SmartSign
+Coalesces concurrent intent predictions into a single multi-citizen GPT call
+"""
+
+import logging
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from micro_batcher import MicroBatcher
+from models.visit_history import VisitHistory, PredictionResult
+from prediction_engine import IntentPredictionEngine
+
+logger = logging.getLogger(__name__)
+
+# (user_id, current_location)
+PredictionKey = Tuple[str, Optional[str]]
+
+
+class PredictionBatcher(MicroBatcher[PredictionKey, PredictionResult]):
+    """
+    Batches /predict-intent and /generate-greeting prediction requests.
+
+    Requests arriving within `window` seconds (up to max_batch_size citizens)
+    are sent to GPT as one numbered prompt. User IDs never appear in the
+    prompt; citizens are identified by their position in the batch.
+    """
+
+    name = "Prediction batcher"
+
+    def __init__(
+        self,
+        engine: IntentPredictionEngine,
+        visits_loader: Callable[[str], Sequence[VisitHistory]],
+        window: float = 0.01,
+        max_batch_size: int = 32,
+    ):
+        super().__init__(window, max_batch_size)
+        self.engine = engine
+        self.visits_loader = visits_loader
+
+    async def predict(self, user_id: str, current_location: Optional[str] = None) -> PredictionResult:
+        """
+        Predict a citizen's visit intent, batched with concurrent callers
+
+        Args:
+            user_id: Citizen's IC number
+            current_location: Current service center
+
+        Returns:
+            PredictionResult for this citizen
+        """
+        return await self.submit((user_id, current_location))
+
+    async def _process_one(self, key: PredictionKey) -> PredictionResult:
+        user_id, current_location = key
+        return await self.engine.predict_intent(
+            user_id=user_id,
+            visits=self.visits_loader(user_id),
+            current_location=current_location,
+        )
+
+    async def _process_many(self, keys: List[PredictionKey]) -> Dict[PredictionKey, PredictionResult]:
+        results = await self.engine.predict_intents(
+            [(self.visits_loader(user_id), current_location) for user_id, current_location in keys]
+        )
+        return {keys[index]: result for index, result in results.items()}
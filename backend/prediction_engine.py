@@ -3,11 +3,13 @@ Predictive Intent Engine for SmartSign
 Uses GPT-4o-mini to analyze visit patterns and predict citizen's visit purpose
 """
 
+import asyncio
 import logging
-import json
-from typing import List, Optional, Dict, Any
+import orjson
+from collections import Counter
+from typing import Optional, Dict, Any, List, Sequence, Tuple
 from datetime import datetime
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from models.visit_history import (
     VisitHistory,
@@ -17,6 +19,59 @@ from models.visit_history import (
 
 logger = logging.getLogger(__name__)
 
+# Shared by the single and batched prediction prompts
+_PREDICTION_GUIDANCE = """Based on this information, predict why this citizen is visiting today. Consider:
+1. Pending follow-ups or document submissions
+2. Renewal cycles (passports, licenses typically renew every 5-10 years)
+3. Continuation of previous applications
+4. New applications based on visit patterns"""
+
+_PREDICTION_JSON_FIELDS = """"predicted_intent": "Brief description of likely purpose (10-15 words max)",
+    "confidence": 0.0-1.0,
+    "reasoning": "Brief explanation based on patterns (20-30 words)",
+    "alternative_intents": [
+        {"intent": "Alternative purpose", "confidence": 0.0-1.0}
+    ]"""
+
+_VISIT_COLUMNS = "#|date|location (department)|purpose|status|documents requested|documents submitted|follow-up by|signs used\n"
+
+# Prompts are assembled by concatenating these around the per-citizen context
+_PREDICTION_PROMPT_HEAD = """You are an AI assistant analyzing visit patterns for a Deaf citizen at a Malaysian government service center.
+
+"""
+
+_PREDICTION_PROMPT_TAIL = f"""
+
+{_PREDICTION_GUIDANCE}
+
+Respond in JSON format:
+{{
+    {_PREDICTION_JSON_FIELDS}
+}}
+
+Only respond with valid JSON, nothing else."""
+
+_BATCH_PREDICTION_PROMPT_HEAD = """You are an AI assistant analyzing visit patterns for Deaf citizens at Malaysian government service centers.
+Each numbered citizen below is a different person; predict for each one independently.
+
+"""
+
+_BATCH_PREDICTION_PROMPT_TAIL = f"""
+
+{_PREDICTION_GUIDANCE}
+
+Respond in JSON format with one entry per citizen:
+{{
+    "predictions": [
+        {{
+            "citizen": 1,
+            {_PREDICTION_JSON_FIELDS}
+        }}
+    ]
+}}
+
+Only respond with valid JSON, nothing else."""
+
 
 class IntentPredictionEngine:
     """
@@ -24,30 +79,25 @@ class IntentPredictionEngine:
     to predict why a citizen is visiting a government service center.
     """
 
-    def __init__(self, openai_client: Optional[OpenAI] = None):
+    def __init__(self, openai_client: Optional[AsyncOpenAI] = None):
         self.client = openai_client
 
-    def _format_visit_history(self, visits: List[VisitHistory]) -> str:
+    def _format_visit_history(self, visits: Sequence[VisitHistory]) -> str:
         """Format visit history for LLM context"""
         if not visits:
             return "No previous visits recorded."
 
-        formatted = []
-        for i, visit in enumerate(visits[:10], 1):  # Limit to 10 most recent
-            formatted.append(f"""
-Visit {i}:
-- Date: {visit.datetime}
-- Location: {visit.location} ({visit.department})
-- Purpose: {visit.application}
-- Status: {visit.status}
-- Documents Requested: {', '.join(visit.documents_requested) if visit.documents_requested else 'None'}
-- Documents Submitted: {', '.join(visit.documents_submitted) if visit.documents_submitted else 'None'}
-- Follow-up Required: {'Yes, by ' + visit.follow_up_date if visit.follow_up_required and visit.follow_up_date else 'No'}
-- Signs Used: {', '.join(visit.phrases_detected) if visit.phrases_detected else 'N/A'}
-""")
-        return "\n".join(formatted)
-
-    def _analyze_patterns(self, visits: List[VisitHistory]) -> Dict[str, Any]:
+        # One dense pipe-separated line per visit: same facts, far fewer tokens
+        return _VISIT_COLUMNS + "\n".join(
+            f"V{i}|{visit.datetime:%Y-%m-%d}|{visit.location} ({visit.department})|{visit.application}"
+            f"|{visit.status.value}|{', '.join(visit.documents_requested) or '-'}"
+            f"|{', '.join(visit.documents_submitted) or '-'}"
+            f"|{visit.follow_up_date if visit.follow_up_required and visit.follow_up_date else 'no'}"
+            f"|{', '.join(visit.phrases_detected) or '-'}"
+            for i, visit in enumerate(visits[:10], 1)  # Limit to 10 most recent
+        )
+
+    def _analyze_patterns(self, visits: Sequence[VisitHistory]) -> Dict[str, Any]:
         """Analyze visit patterns for context"""
         if not visits:
             return {
@@ -57,11 +107,8 @@ Visit {i}:
                 "recent_documents_requested": [],
             }
 
-        # Count department frequency
-        dept_counts = {}
-        for visit in visits:
-            dept_counts[visit.location] = dept_counts.get(visit.location, 0) + 1
-        frequent_depts = sorted(dept_counts.items(), key=lambda x: x[1], reverse=True)[:3]
+        # Count department frequency (single C-level pass; ties keep first-seen order)
+        frequent_depts = Counter(visit.location for visit in visits).most_common(3)
 
         # Find pending follow-ups
         pending = [v for v in visits if v.follow_up_required and v.status != "Completed"]
@@ -88,7 +135,7 @@ Visit {i}:
     async def predict_intent(
         self,
         user_id: str,
-        visits: List[VisitHistory],
+        visits: Sequence[VisitHistory],
         current_location: Optional[str] = None,
     ) -> PredictionResult:
         """
@@ -104,78 +151,165 @@ Visit {i}:
         """
         # Analyze patterns first
         patterns = self._analyze_patterns(visits)
-        history_text = self._format_visit_history(visits)
 
         # If no OpenAI client, use rule-based fallback
         if not self.client:
             return self._fallback_prediction(visits, patterns, current_location)
 
         try:
-            prompt = f"""You are an AI assistant analyzing visit patterns for a Deaf citizen at a Malaysian government service center.
-
-Current Location: {current_location or 'Unknown'}
-Today's Date: {datetime.now().strftime('%Y-%m-%d')}
-
-Visit History:
-{history_text}
-
-Pattern Analysis:
-- Total previous visits: {patterns['total_visits']}
-- Frequently visited: {', '.join([d['dept'] for d in patterns['frequent_departments']]) or 'None'}
-- Pending follow-ups: {len(patterns['pending_follow_ups'])}
-- Recent document requests: {len(patterns['recent_documents_requested'])}
-
-Based on this information, predict why this citizen is visiting today. Consider:
-1. Pending follow-ups or document submissions
-2. Renewal cycles (passports, licenses typically renew every 5-10 years)
-3. Continuation of previous applications
-4. New applications based on visit patterns
-
-Respond in JSON format:
-{{
-    "predicted_intent": "Brief description of likely purpose (10-15 words max)",
-    "confidence": 0.0-1.0,
-    "reasoning": "Brief explanation based on patterns (20-30 words)",
-    "alternative_intents": [
-        {{"intent": "Alternative purpose", "confidence": 0.0-1.0}}
-    ]
-}}
-
-Only respond with valid JSON, nothing else."""
+            prompt = (
+                _PREDICTION_PROMPT_HEAD
+                + self._format_citizen_context(visits, patterns, current_location)
+                + _PREDICTION_PROMPT_TAIL
+            )
 
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 max_tokens=300,
                 response_format={"type": "json_object"},
                 messages=[{"role": "user", "content": prompt}]
             )
 
-            result = json.loads(response.choices[0].message.content)
-
-            confidence = min(max(float(result.get("confidence", 0.5)), 0.0), 1.0)
-
-            return PredictionResult(
-                predicted_intent=result.get("predicted_intent", "General inquiry"),
-                confidence=confidence,
-                reasoning=result.get("reasoning", "Based on visit history analysis"),
-                display_text=f"Likely purpose: {result.get('predicted_intent', 'General inquiry')} ({int(confidence * 100)}% confidence)",
-                alternative_intents=[
-                    AlternativeIntent(
-                        intent=alt.get("intent", ""),
-                        confidence=min(max(float(alt.get("confidence", 0.3)), 0.0), 1.0)
-                    )
-                    for alt in result.get("alternative_intents", [])[:3]
-                ],
-                supporting_visits=[v.id for v in visits[:3]] if visits else []
-            )
+            result = orjson.loads(response.choices[0].message.content)
+            return self._to_prediction(result, visits)
 
         except Exception as e:
             logger.error(f"Prediction failed: {str(e)}")
             return self._fallback_prediction(visits, patterns, current_location)
 
+    async def predict_intents(
+        self,
+        requests: Sequence[Tuple[Sequence[VisitHistory], Optional[str]]],
+    ) -> Dict[int, PredictionResult]:
+        """
+        Predict intents for several citizens with one GPT call
+
+        Args:
+            requests: (visits, current_location) per citizen
+
+        Returns:
+            PredictionResult per request index; indexes the model skipped are omitted
+
+        Raises:
+            RuntimeError: If no OpenAI client is configured
+            ValueError: If the response contains no usable predictions
+        """
+        if not self.client:
+            raise RuntimeError("OpenAI client not configured")
+
+        citizens = "\n\n".join(
+            f"=== Citizen {i} ===\n{self._format_citizen_context(visits, self._analyze_patterns(visits), location)}"
+            for i, (visits, location) in enumerate(requests, 1)
+        )
+
+        prompt = _BATCH_PREDICTION_PROMPT_HEAD + citizens + _BATCH_PREDICTION_PROMPT_TAIL
+
+        response = await self.client.chat.completions.create(
+            model="gpt-4o-mini",
+            max_tokens=300 * len(requests),
+            response_format={"type": "json_object"},
+            messages=[{"role": "user", "content": prompt}]
+        )
+
+        results = {}
+        for entry in orjson.loads(response.choices[0].message.content).get("predictions", []):
+            try:
+                index = int(entry.get("citizen", 0)) - 1
+            except (TypeError, ValueError):
+                continue
+            if 0 <= index < len(requests) and index not in results:
+                results[index] = self._to_prediction(entry, requests[index][0])
+
+        if not results:
+            raise ValueError("Could not parse batched prediction response")
+
+        return results
+
+    async def predict_intents_bulk(
+        self,
+        jobs: Sequence[Tuple[str, Sequence[VisitHistory], Optional[str]]],
+        chunk_size: int = 16,
+        max_concurrency: int = 4,
+    ) -> List[PredictionResult]:
+        """
+        Predict intents for many citizens (e.g. warming caches ahead of opening)
+
+        Jobs are sent as multi-citizen prompts of chunk_size, with up to
+        max_concurrency GPT calls in flight. Citizens a chunk couldn't answer
+        are retried one by one (which falls back to rules on failure).
+
+        Args:
+            jobs: (user_id, visits, current_location) per citizen
+
+        Returns:
+            PredictionResult per job, in order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_chunk(chunk) -> List[PredictionResult]:
+            async with semaphore:
+                results: Dict[int, PredictionResult] = {}
+                if self.client and len(chunk) > 1:
+                    try:
+                        results = await self.predict_intents([(visits, location) for _, visits, location in chunk])
+                    except Exception as e:
+                        logger.warning(f"Bulk prediction chunk failed, retrying individually: {str(e)}")
+
+                predictions = []
+                for index, (user_id, visits, location) in enumerate(chunk):
+                    if index not in results:
+                        results[index] = await self.predict_intent(
+                            user_id=user_id, visits=visits, current_location=location
+                        )
+                    predictions.append(results[index])
+                return predictions
+
+        chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+        chunk_results = await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+
+        return [prediction for chunk in chunk_results for prediction in chunk]
+
+    def _format_citizen_context(
+        self,
+        visits: Sequence[VisitHistory],
+        patterns: Dict[str, Any],
+        current_location: Optional[str] = None
+    ) -> str:
+        """Per-citizen prompt block: location, date, history and pattern summary"""
+        return f"""Current Location: {current_location or 'Unknown'}
+Today's Date: {datetime.now().strftime('%Y-%m-%d')}
+
+Visit History:
+{self._format_visit_history(visits)}
+
+Pattern Analysis:
+- Total previous visits: {patterns['total_visits']}
+- Frequently visited: {', '.join([d['dept'] for d in patterns['frequent_departments']]) or 'None'}
+- Pending follow-ups: {len(patterns['pending_follow_ups'])}
+- Recent document requests: {len(patterns['recent_documents_requested'])}"""
+
+    def _to_prediction(self, result: Dict[str, Any], visits: Sequence[VisitHistory]) -> PredictionResult:
+        """Build a PredictionResult from the model's JSON answer"""
+        confidence = min(max(float(result.get("confidence", 0.5)), 0.0), 1.0)
+
+        return PredictionResult(
+            predicted_intent=result.get("predicted_intent", "General inquiry"),
+            confidence=confidence,
+            reasoning=result.get("reasoning", "Based on visit history analysis"),
+            display_text=f"Likely purpose: {result.get('predicted_intent', 'General inquiry')} ({int(confidence * 100)}% confidence)",
+            alternative_intents=[
+                AlternativeIntent(
+                    intent=alt.get("intent", ""),
+                    confidence=min(max(float(alt.get("confidence", 0.3)), 0.0), 1.0)
+                )
+                for alt in result.get("alternative_intents", [])[:3]
+            ],
+            supporting_visits=[v.id for v in visits[:3]] if visits else []
+        )
+
     def _fallback_prediction(
         self,
-        visits: List[VisitHistory],
+        visits: Sequence[VisitHistory],
         patterns: Dict[str, Any],
         current_location: Optional[str] = None
     ) -> PredictionResult:
@@ -221,5 +355,6 @@ Only respond with valid JSON, nothing else."""
                 AlternativeIntent(intent="General inquiry", confidence=0.30),
                 AlternativeIntent(intent="Document collection", confidence=0.25),
             ],
-            supporting_visits=[v.id for v in visits[:3]] if visits else []
+            supporting_visits=[v.id for v in visits[:3]] if visits else [],
+            is_fallback=True
         )
@@ -0,0 +1,106 @@
+"""
+Quantize the exported BIM ONNX model to INT8
+Static (calibrated) quantization with ONNX Runtime for faster on-device inference
+
+Usage:
+    python quantize_onnx_model.py bim-recognition-v10.onnx calibration_images/ [bim-recognition-v10.int8.onnx]
+
+Then point BIM_ONNX_MODEL at the quantized file.
+"""
+import os
+import sys
+from typing import Dict, Iterator, Optional
+
+import cv2
+import numpy as np
+import onnxruntime as ort
+from onnxruntime.quantization import (
+    CalibrationDataReader,
+    QuantFormat,
+    QuantType,
+    quantize_static,
+)
+from onnxruntime.quantization.shape_inference import quant_pre_process
+
+from onnx_detector import letterbox
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+# ~100 representative frames is plenty for activation ranges
+MAX_CALIBRATION_IMAGES = 100
+
+
+class ImageFolderReader(CalibrationDataReader):
+    """Feeds letterboxed calibration images to the quantizer, one at a time"""
+
+    def __init__(self, model_path: str, image_dir: str):
+        model_input = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"]).get_inputs()[0]
+        self.input_name = model_input.name
+        self.input_size = int(model_input.shape[2]) if isinstance(model_input.shape[2], int) else 640
+
+        paths = sorted(
+            os.path.join(image_dir, name)
+            for name in os.listdir(image_dir)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )[:MAX_CALIBRATION_IMAGES]
+        if not paths:
+            raise ValueError(f"No calibration images found in {image_dir}")
+
+        print(f"📸 Calibrating with {len(paths)} images from {image_dir}")
+        self._batches: Iterator[Dict[str, np.ndarray]] = self._read(paths)
+
+    def _read(self, paths) -> Iterator[Dict[str, np.ndarray]]:
+        for path in paths:
+            image = cv2.imread(path, cv2.IMREAD_COLOR)
+            if image is None:
+                print(f"⚠️  Skipping unreadable image: {path}")
+                continue
+            blob, _ = letterbox(image, self.input_size)
+            yield {self.input_name: blob}
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        return next(self._batches, None)
+
+
+def quantize(model_path: str, image_dir: str, output_path: str):
+    """Pre-process, calibrate and write an INT8 QDQ model"""
+    prepared_path = os.path.splitext(output_path)[0] + ".prep.onnx"
+
+    # The source model must survive: pre-processing writes prepared_path, which is removed afterwards
+    source = os.path.abspath(model_path)
+    if source in (os.path.abspath(output_path), os.path.abspath(prepared_path)):
+        raise ValueError(f"Output path would overwrite the source model {model_path}; pass a different output path")
+
+    # Shape inference + graph optimizations make more nodes quantizable
+    quant_pre_process(model_path, prepared_path)
+
+    quantize_static(
+        prepared_path,
+        output_path,
+        ImageFolderReader(prepared_path, image_dir),
+        # QDQ runs on CPU (VNNI) and is what TensorRT expects for INT8
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+    )
+    os.remove(prepared_path)
+
+    original_mb = os.path.getsize(model_path) / 1e6
+    quantized_mb = os.path.getsize(output_path) / 1e6
+    print(f"✅ Saved {output_path} ({original_mb:.1f} MB -> {quantized_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    model = sys.argv[1]
+    images = sys.argv[2]
+    output = sys.argv[3] if len(sys.argv) > 3 else os.path.splitext(model)[0] + ".int8.onnx"
+
+    try:
+        quantize(model, images, output)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
@@ -34,11 +34,14 @@ def setup_env():
             return
         openai_key = ""
     
-    # Roboflow API key (already configured)
-    print("\n2. Roboflow API Key (already configured)")
-    roboflow_key = input("   Press Enter to use default or enter custom key: ").strip()
+    # Roboflow API key (required for sign detection)
+    print("\n2. Roboflow API Key (required)")
+    print("   Get it from: https://app.roboflow.com/settings/api")
+    roboflow_key = input("   Enter your Roboflow API key: ").strip()
     if not roboflow_key:
-        roboflow_key = "PfNLBY9FSfXGfx9lccYk"
+        print("\n❌ A Roboflow API key is required for sign detection.")
+        print("Setup cancelled.")
+        return
     
     # Create .env file
     env_content = f"""# OpenAI API Key for AI interpretation (GPT-4o-mini)
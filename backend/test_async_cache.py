@@ -0,0 +1,160 @@
+"""
+Tests for AsyncLRUCache (single-flight, failure eviction, TTL, LRU eviction)
+
+Run with: pytest test_async_cache.py
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import async_cache
+from async_cache import AsyncLRUCache
+
+
+class CountingFactory:
+    """Slow coroutine factory that counts how often it actually runs"""
+
+    def __init__(self, value="result", delay=0.01, error=None):
+        self.value = value
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable stand-in for time.monotonic inside async_cache"""
+    now = [1000.0]
+    monkeypatch.setattr(async_cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_concurrent_misses_share_one_call():
+    cache = AsyncLRUCache()
+    factory = CountingFactory()
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_set("key", factory) for _ in range(10)))
+
+    results = asyncio.run(scenario())
+
+    assert results == ["result"] * 10
+    assert factory.calls == 1
+    assert cache.cache_info()["misses"] == 1
+    assert cache.cache_info()["hits"] == 9
+
+
+def test_failures_are_not_cached():
+    cache = AsyncLRUCache()
+    failing = CountingFactory(error=ValueError("boom"))
+    working = CountingFactory()
+
+    async def scenario():
+        with pytest.raises(ValueError):
+            await cache.get_or_set("key", failing)
+        return await cache.get_or_set("key", working)
+
+    assert asyncio.run(scenario()) == "result"
+    assert failing.calls == 1
+    assert working.calls == 1
+
+
+def test_waiters_see_the_first_callers_failure():
+    cache = AsyncLRUCache()
+    factory = CountingFactory(error=ValueError("boom"))
+
+    async def scenario():
+        return await asyncio.gather(
+            *(cache.get_or_set("key", factory) for _ in range(3)),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert factory.calls == 1
+
+
+def test_rejected_results_are_shared_but_not_kept():
+    cache = AsyncLRUCache()
+    factory = CountingFactory(value="fallback")
+
+    async def scenario():
+        first = await asyncio.gather(
+            *(cache.get_or_set("key", factory, cacheable=lambda r: r != "fallback") for _ in range(3))
+        )
+        await cache.get_or_set("key", factory, cacheable=lambda r: r != "fallback")
+        return first
+
+    assert asyncio.run(scenario()) == ["fallback"] * 3
+    # One call for the concurrent burst, a fresh one afterwards
+    assert factory.calls == 2
+    assert cache.cache_info()["size"] == 0
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = AsyncLRUCache(ttl=60)
+    factory = CountingFactory()
+
+    async def scenario():
+        await cache.get_or_set("key", factory)
+        clock[0] += 59
+        await cache.get_or_set("key", factory)
+        calls_before_expiry = factory.calls
+        clock[0] += 2
+        await cache.get_or_set("key", factory)
+        return calls_before_expiry
+
+    assert asyncio.run(scenario()) == 1
+    assert factory.calls == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = AsyncLRUCache(maxsize=2)
+    factory = CountingFactory()
+
+    async def scenario():
+        await cache.get_or_set("a", factory)
+        await cache.get_or_set("b", factory)
+        await cache.get_or_set("a", factory)  # "b" is now least recently used
+        await cache.get_or_set("c", factory)
+        await cache.get_or_set("a", factory)
+        await cache.get_or_set("b", factory)
+
+    asyncio.run(scenario())
+
+    # a, b, c, then b again after eviction
+    assert factory.calls == 4
+
+
+def test_set_stores_a_ready_value():
+    cache = AsyncLRUCache()
+    factory = CountingFactory()
+
+    async def scenario():
+        cache.set("key", "precomputed")
+        return await cache.get_or_set("key", factory)
+
+    assert asyncio.run(scenario()) == "precomputed"
+    assert factory.calls == 0
+
+
+def test_invalidate_drops_matching_keys():
+    cache = AsyncLRUCache()
+    factory = CountingFactory()
+
+    async def scenario():
+        for key in (("predict", "u1"), ("predict", "u2"), ("brief", "u1")):
+            await cache.get_or_set(key, factory)
+        return cache.invalidate(lambda key: key[1] == "u1")
+
+    assert asyncio.run(scenario()) == 2
+    assert cache.cache_info()["size"] == 1
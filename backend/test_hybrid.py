@@ -15,7 +15,11 @@ def test_hybrid_detector():
     print("=" * 60)
     
     # Initialize detector
-    api_key = os.getenv("ROBOFLOW_API_KEY", "PfNLBY9FSfXGfx9lccYk")
+    api_key = os.getenv("ROBOFLOW_API_KEY")
+    if not api_key:
+        print("❌ ROBOFLOW_API_KEY is not set")
+        print("   Add it to backend/.env (run setup_env.py)")
+        return False
     detector = HybridSignDetector(roboflow_api_key=api_key)
     
     # Test with a sample image
@@ -0,0 +1,125 @@
+"""
+Tests for image_codec (decode/encode, downscaling and box rescaling)
+
+Run with: pytest test_image_codec.py
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from image_codec import _has_exif, decode_image, downscale, encode_jpeg, rescale_boxes
+
+
+def _frame(height=120, width=200):
+    """Gradient BGR test frame (smooth, so JPEG round-trips closely)"""
+    ramp = np.linspace(0, 255, width, dtype=np.uint8)
+    return np.dstack([np.tile(ramp, (height, 1))] * 3)
+
+
+def _with_exif_after_app0(jpeg, orientation=6):
+    """Insert an EXIF APP1 (one orientation tag) after the JFIF APP0 segment, as phone uploads have it"""
+    tiff = (
+        b"MM\x00\x2a\x00\x00\x00\x08"  # Big-endian header, IFD at offset 8
+        + b"\x00\x01"  # One entry: Orientation, SHORT, count 1
+        + b"\x01\x12\x00\x03\x00\x00\x00\x01" + orientation.to_bytes(2, "big") + b"\x00\x00"
+        + b"\x00\x00\x00\x00"  # No next IFD
+    )
+    payload = b"Exif\x00\x00" + tiff
+    app1 = b"\xff\xe1" + (len(payload) + 2).to_bytes(2, "big") + payload
+    app0_end = 4 + int.from_bytes(jpeg[4:6], "big")
+    return jpeg[:app0_end] + app1 + jpeg[app0_end:]
+
+
+def test_jpeg_round_trip():
+    image = _frame()
+
+    decoded = decode_image(encode_jpeg(image, quality=95))
+
+    assert decoded.shape == image.shape
+    assert np.abs(decoded.astype(int) - image.astype(int)).mean() < 3
+
+
+def test_png_decodes():
+    import cv2
+
+    image = _frame()
+    ok, png = cv2.imencode(".png", image)
+    assert ok
+
+    assert np.array_equal(decode_image(png.tobytes()), image)
+
+
+def test_exif_after_jfif_app0_is_found():
+    jpeg = encode_jpeg(_frame(), quality=95)
+    assert jpeg[3] == 0xE0  # JFIF APP0 first
+
+    assert not _has_exif(jpeg)
+    assert _has_exif(_with_exif_after_app0(jpeg))
+
+
+def test_exif_orientation_is_applied():
+    decoded = decode_image(_with_exif_after_app0(encode_jpeg(_frame(120, 200), quality=95)))
+
+    # Orientation 6 rotates 90 degrees clockwise
+    assert decoded.shape[:2] == (200, 120)
+
+
+@pytest.mark.parametrize("cut", [3, 6, 9])
+def test_exif_scan_handles_truncated_data(cut):
+    data = _with_exif_after_app0(encode_jpeg(_frame(), quality=95))
+    app0_end = 4 + int.from_bytes(data[4:6], "big")
+
+    assert not _has_exif(data[:app0_end + cut])
+
+
+@pytest.mark.parametrize("data", [b"\xff\xd8\xff", b"\xff\xd8\xff\xe0garbage", b"not an image"])
+def test_undecodable_bytes_return_none(data):
+    assert decode_image(data) is None
+
+
+def test_downscale_leaves_small_images_alone():
+    image = _frame(100, 200)
+
+    resized, scale = downscale(image, 640)
+
+    assert resized is image
+    assert scale == 1.0
+
+
+def test_downscale_caps_the_longest_side():
+    image = _frame(600, 1280)
+
+    resized, scale = downscale(image, 640)
+
+    assert scale == 0.5
+    assert resized.shape[:2] == (300, 640)
+
+
+def test_rescale_boxes_maps_back_to_upload_pixels():
+    boxes = [{
+        "x": 10.0, "y": 20.0, "width": 30.0, "height": 40.0, "confidence": 0.9,
+        "landmarks": {"coordinates": [{"x": 1.0, "y": 2.0, "z": 3.0}]},
+    }]
+
+    rescale_boxes(boxes, 0.5)
+
+    assert boxes[0]["x"] == 20.0
+    assert boxes[0]["y"] == 40.0
+    assert boxes[0]["width"] == 60.0
+    assert boxes[0]["height"] == 80.0
+    assert boxes[0]["confidence"] == 0.9
+    assert boxes[0]["landmarks"]["coordinates"][0] == {"x": 2.0, "y": 4.0, "z": 6.0}
+
+
+def test_rescale_boxes_skips_missing_coordinates():
+    boxes = [{"class": "tolong", "x": None}, {"class": "saya"}]
+
+    assert rescale_boxes(boxes, 0.5) == [{"class": "tolong", "x": None}, {"class": "saya"}]
+
+
+def test_rescale_boxes_is_a_no_op_at_full_scale():
+    boxes = [{"x": 10.0}]
+
+    assert rescale_boxes(boxes, 1.0) is boxes
+    assert boxes[0]["x"] == 10.0
@@ -0,0 +1,137 @@
+"""
+Tests for the MicroBatcher base class (dedup, window flush, split-and-retry)
+
+Run with: pytest test_micro_batcher.py
+"""
+import asyncio
+
+import pytest
+
+from micro_batcher import MicroBatcher
+
+
+class RecordingBatcher(MicroBatcher[str, str]):
+    """Upper-cases keys and records every call; keys in `bad` fail, keys in `dropped` go missing"""
+
+    def __init__(self, window=0.02, max_batch_size=16, bad=(), dropped=()):
+        super().__init__(window=window, max_batch_size=max_batch_size)
+        self.bad = set(bad)
+        self.dropped = set(dropped)
+        self.one_calls = []
+        self.many_calls = []
+
+    async def _process_one(self, key):
+        self.one_calls.append(key)
+        if key in self.bad:
+            raise ValueError(f"bad key {key}")
+        return key.upper()
+
+    async def _process_many(self, keys):
+        self.many_calls.append(list(keys))
+        if self.bad.intersection(keys):
+            raise ValueError("batch contains a bad key")
+        return {key: key.upper() for key in keys if key not in self.dropped}
+
+
+async def _run_batch(batcher, keys):
+    """Submit keys concurrently through a started batcher"""
+    batcher.start()
+    try:
+        return await asyncio.gather(*(batcher.submit(key) for key in keys), return_exceptions=True)
+    finally:
+        await batcher.stop()
+
+
+def test_submit_without_worker_calls_directly():
+    batcher = RecordingBatcher()
+
+    assert asyncio.run(batcher.submit("a")) == "A"
+    assert batcher.one_calls == ["a"]
+    assert batcher.many_calls == []
+
+
+def test_identical_keys_in_a_window_share_one_call():
+    batcher = RecordingBatcher()
+
+    results = asyncio.run(_run_batch(batcher, ["a", "b", "a", "a"]))
+
+    assert results == ["A", "B", "A", "A"]
+    assert batcher.many_calls == [["a", "b"]]
+    assert batcher.one_calls == []
+
+
+def test_single_distinct_key_uses_process_one():
+    batcher = RecordingBatcher()
+
+    results = asyncio.run(_run_batch(batcher, ["a", "a"]))
+
+    assert results == ["A", "A"]
+    assert batcher.one_calls == ["a"]
+    assert batcher.many_calls == []
+
+
+def test_failed_batch_is_split_so_good_keys_still_succeed():
+    batcher = RecordingBatcher(bad={"c"})
+
+    results = asyncio.run(_run_batch(batcher, ["a", "b", "c", "d"]))
+
+    assert results[:2] == ["A", "B"]
+    assert isinstance(results[2], ValueError)
+    assert results[3] == "D"
+    # Whole batch, then the halves; only the half with the bad key is split again
+    assert batcher.many_calls == [["a", "b", "c", "d"], ["a", "b"], ["c", "d"]]
+    assert sorted(batcher.one_calls) == ["c", "d"]
+
+
+def test_keys_missing_from_batch_result_are_retried():
+    batcher = RecordingBatcher(dropped={"b"})
+
+    results = asyncio.run(_run_batch(batcher, ["a", "b"]))
+
+    assert results == ["A", "B"]
+    assert batcher.one_calls == ["b"]
+
+
+def test_window_flushes_a_partial_batch():
+    batcher = RecordingBatcher(window=0.05)
+
+    async def scenario():
+        batcher.start()
+        try:
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            result = await asyncio.wait_for(batcher.submit("a"), timeout=1)
+            return result, loop.time() - started
+        finally:
+            await batcher.stop()
+
+    result, elapsed = asyncio.run(scenario())
+
+    assert result == "A"
+    assert elapsed >= 0.04
+
+
+def test_full_batch_flushes_before_the_window():
+    batcher = RecordingBatcher(window=10, max_batch_size=2)
+
+    results = asyncio.run(asyncio.wait_for(_run_batch(batcher, ["a", "b"]), timeout=1))
+
+    assert results == ["A", "B"]
+    assert batcher.many_calls == [["a", "b"]]
+
+
+def test_stop_fails_requests_still_queued():
+    batcher = RecordingBatcher()
+
+    async def scenario():
+        batcher.start()
+        # Queued but never collected: the worker hasn't had a chance to run yet
+        future = asyncio.get_running_loop().create_future()
+        batcher._queue.put_nowait(("a", future))
+        await batcher.stop()
+        return future
+
+    future = asyncio.run(scenario())
+
+    with pytest.raises(RuntimeError):
+        future.result()
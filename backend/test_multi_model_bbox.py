@@ -73,15 +73,11 @@ def test_multi_model_detector():
         # Save annotated image
         if result.get("annotated_image"):
             print(f"\n💾 Saving annotated image...")
-            import base64
-            
-            # Extract base64 data
-            image_base64 = result["annotated_image"].split(",")[1]
-            image_bytes = base64.b64decode(image_base64)
             
+            # Detector returns raw JPEG bytes
             output_path = "test_annotated.jpg"
             with open(output_path, "wb") as f:
-                f.write(image_bytes)
+                f.write(result["annotated_image"])
             
             print(f"   ✅ Saved to: {output_path}")
             print(f"   Open this file to see bounding boxes from all models!")
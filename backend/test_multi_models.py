@@ -1,15 +1,21 @@
 """
 Test script for multiple Roboflow BIM Sign Language Recognition models
 """
-from inference_sdk import InferenceHTTPClient
-import json
+import asyncio
+import httpx
+import orjson
+import sys
+from operator import itemgetter
 
-# Initialize the Roboflow client
-CLIENT = InferenceHTTPClient(
-    api_url="https://detect.roboflow.com",
-    api_key="PfNLBY9FSfXGfx9lccYk"
+from _roboflow_settings import (
+    API_URL, API_KEY, UPLOAD_HEADERS, MAX_RETRIES, RETRY_STATUSES,
+    backoff_delay, load_image, load_cached, save_cached
 )
 
+# Console banners
+BAR = "=" * 60
+DASH = "-" * 60
+
 # Multiple models
 MODELS = {
     "BIM Recognition v10": "bim-recognition-x7qsz/10",
@@ -19,58 +25,121 @@ MODELS = {
     "Sign Language Detection (Chandana)": "sign-language-detection-nygkw/2",
 }
 
-def test_model(model_name, model_id):
-    """Test a single model"""
-    print(f"\n{'='*60}")
-    print(f"Testing: {model_name}")
-    print(f"Model ID: {model_id}")
-    print('='*60)
+def format_prediction(i, pred):
+    """Report lines for one prediction"""
+    lines = [
+        f"\n  Prediction {i}:",
+        f"    Class: {pred.get('class', 'N/A')}",
+        f"    Confidence: {pred.get('confidence', 0):.2%}",
+    ]
+    if 'x' in pred and 'y' in pred:
+        lines.append(f"    Position: ({pred['x']:.1f}, {pred['y']:.1f})")
+    if 'width' in pred and 'height' in pred:
+        lines.append(f"    Size: {pred['width']:.1f}x{pred['height']:.1f}")
+    return "\n".join(lines)
+
+async def infer_one(client, model_id, image_b64, image_hash):
+    """Run one model on the base64-encoded image"""
+    cached = load_cached(image_hash, model_id)
+    if cached is not None:
+        return cached
     
-    try:
-        result = CLIENT.infer("test.jpg", model_id=model_id)
-        
-        if "predictions" in result and result["predictions"]:
-            print(f"✅ Success! Found {len(result['predictions'])} prediction(s)")
-            
-            for i, pred in enumerate(result["predictions"], 1):
-                print(f"\n  Prediction {i}:")
-                print(f"    Class: {pred.get('class', 'N/A')}")
-                print(f"    Confidence: {pred.get('confidence', 0):.2%}")
-                if 'x' in pred and 'y' in pred:
-                    print(f"    Position: ({pred['x']:.1f}, {pred['y']:.1f})")
-                if 'width' in pred and 'height' in pred:
-                    print(f"    Size: {pred['width']:.1f}x{pred['height']:.1f}")
-        else:
-            print("⚠️  No predictions found")
-            
-        return result
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = await client.post(
+                f"{API_URL}/{model_id}",
+                params={"api_key": API_KEY},
+                content=image_b64,
+                headers=UPLOAD_HEADERS
+            )
+        except httpx.TransportError:
+            if attempt == MAX_RETRIES:
+                raise
+            await asyncio.sleep(backoff_delay(attempt))
+            continue
         
+        if response.status_code in RETRY_STATUSES and attempt < MAX_RETRIES:
+            await asyncio.sleep(backoff_delay(attempt, response.headers.get("Retry-After")))
+            continue
+        break
+    
+    response.raise_for_status()
+    result = orjson.loads(response.content)
+    save_cached(image_hash, model_id, result)
+    return result
+
+async def test_model(client, model_name, model_id, image_b64, image_hash):
+    """Test a single model"""
+    try:
+        result = await infer_one(client, model_id, image_b64, image_hash)
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
-        return None
+        result = e
+    
+    # Build the report and write it in one go, once the request is done,
+    # so concurrent tests don't interleave
+    lines = [
+        f"\n{BAR}",
+        f"Testing: {model_name}",
+        f"Model ID: {model_id}",
+        BAR,
+    ]
+    
+    if isinstance(result, Exception):
+        lines.append(f"❌ Error: {str(result)}")
+        result = None
+    elif "predictions" in result and result["predictions"]:
+        lines.append(f"✅ Success! Found {len(result['predictions'])} prediction(s)")
+        lines.extend(format_prediction(i, pred) for i, pred in enumerate(result["predictions"], 1))
+    else:
+        lines.append("⚠️  No predictions found")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+    return result
 
-def compare_models():
+async def compare_models():
     """Compare results from all models"""
-    print("\n" + "="*60)
+    print("\n" + BAR)
     print("COMPARING ALL MODELS")
-    print("="*60)
+    print(BAR)
+    
+    # Read and encode the image once for every model
+    image_b64, image_hash = load_image("test.jpg")
+    
+    # All models run concurrently over one pooled connection
+    async with httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+        timeout=30.0
+    ) as client:
+        # Resolve DNS and finish the TLS handshake up front so every model's
+        # request multiplexes over the one HTTP/2 connection
+        try:
+            await client.head(API_URL, timeout=5.0)
+        except httpx.HTTPError:
+            pass
+        
+        model_results = await asyncio.gather(*(
+            test_model(client, model_name, model_id, image_b64, image_hash)
+            for model_name, model_id in MODELS.items()
+        ))
     
     results = {}
     
-    for model_name, model_id in MODELS.items():
-        result = test_model(model_name, model_id)
-        if result and "predictions" in result and result["predictions"]:
-            best_pred = max(result["predictions"], key=lambda x: x.get("confidence", 0))
+    for model_name, result in zip(MODELS, model_results):
+        predictions = result.get("predictions") if result else None
+        if predictions:
+            # Roboflow always includes class and confidence on a prediction
+            best_pred = max(predictions, key=itemgetter("confidence"))
             results[model_name] = {
-                "class": best_pred.get("class"),
-                "confidence": best_pred.get("confidence", 0),
-                "total_predictions": len(result["predictions"])
+                "class": best_pred["class"],
+                "confidence": best_pred["confidence"],
+                "total_predictions": len(predictions)
             }
     
     if results:
-        print("\n" + "="*60)
+        print("\n" + BAR)
         print("SUMMARY")
-        print("="*60)
+        print(BAR)
         
         for model_name, data in results.items():
             print(f"\n{model_name}:")
@@ -86,10 +155,10 @@ def compare_models():
 
 if __name__ == "__main__":
     print("Testing Multiple Roboflow BIM Sign Language Recognition Models")
-    print("-" * 60)
+    print(DASH)
     
     try:
-        compare_models()
+        asyncio.run(compare_models())
     except FileNotFoundError:
         print("\n❌ Error: test.jpg not found in the current directory")
         print("   Please make sure test.jpg exists in the backend folder")
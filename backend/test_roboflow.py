@@ -1,42 +1,91 @@
 """
 Test script for Roboflow BIM Sign Language Recognition
 """
-from inference_sdk import InferenceHTTPClient
-import json
+import orjson
+import requests
+import sys
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Initialize the Roboflow client
-CLIENT = InferenceHTTPClient(
-    api_url="https://detect.roboflow.com",
-    api_key="PfNLBY9FSfXGfx9lccYk"
+from _roboflow_settings import (
+    API_URL, API_KEY, UPLOAD_HEADERS, MAX_RETRIES, RETRY_STATUSES, BACKOFF_FACTOR,
+    load_image, load_cached, save_cached
 )
 
+MODEL_ID = "bim-recognition-x7qsz/10"
+
+# Console banners
+BAR = "=" * 50
+DASH = "-" * 50
+
+# One keep-alive session for every request, retrying rate limits and gateway errors
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(max_retries=Retry(
+    total=MAX_RETRIES,
+    backoff_factor=BACKOFF_FACTOR,
+    status_forcelist=RETRY_STATUSES,
+    allowed_methods=None,  # Inference POSTs are safe to repeat
+    respect_retry_after_header=True,
+    raise_on_status=False
+)))
+
+# Read and base64-encode the test image once
+try:
+    IMG_B64, IMG_HASH = load_image("test.jpg")
+except FileNotFoundError:
+    IMG_B64 = IMG_HASH = None
+
+def infer(model_id):
+    """Run a model on test.jpg via Roboflow's raw base64 endpoint"""
+    if IMG_B64 is None:
+        raise FileNotFoundError("test.jpg")
+    
+    cached = load_cached(IMG_HASH, model_id)
+    if cached is not None:
+        return cached
+    
+    response = SESSION.post(
+        f"{API_URL}/{model_id}",
+        params={"api_key": API_KEY},
+        data=IMG_B64,
+        headers=UPLOAD_HEADERS,
+        timeout=30
+    )
+    response.raise_for_status()
+    result = orjson.loads(response.content)
+    save_cached(IMG_HASH, model_id, result)
+    return result
+
 def test_inference():
     """Test the Roboflow model with test.jpg"""
     print("Testing Roboflow BIM Sign Language Recognition...")
-    print("-" * 50)
+    print(DASH)
     
     try:
         # Run inference on test image
-        result = CLIENT.infer("test.jpg", model_id="bim-recognition-x7qsz/10")
+        result = infer(MODEL_ID)
         
         # Pretty print the result
         print("\n✅ Inference successful!")
         print("\nFull Result:")
-        print(json.dumps(result, indent=2))
+        print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
         
         # Extract predictions if available
         if "predictions" in result and result["predictions"]:
-            print("\n" + "=" * 50)
+            print("\n" + BAR)
             print("PREDICTIONS:")
-            print("=" * 50)
+            print(BAR)
+            # One write for all predictions instead of a print per field
+            lines = []
             for i, pred in enumerate(result["predictions"], 1):
-                print(f"\nPrediction {i}:")
-                print(f"  Class: {pred.get('class', 'N/A')}")
-                print(f"  Confidence: {pred.get('confidence', 0):.2%}")
+                lines.append(f"\nPrediction {i}:")
+                lines.append(f"  Class: {pred.get('class', 'N/A')}")
+                lines.append(f"  Confidence: {pred.get('confidence', 0):.2%}")
                 if 'x' in pred and 'y' in pred:
-                    print(f"  Position: ({pred['x']:.1f}, {pred['y']:.1f})")
+                    lines.append(f"  Position: ({pred['x']:.1f}, {pred['y']:.1f})")
                 if 'width' in pred and 'height' in pred:
-                    print(f"  Size: {pred['width']:.1f}x{pred['height']:.1f}")
+                    lines.append(f"  Size: {pred['width']:.1f}x{pred['height']:.1f}")
+            sys.stdout.write("\n".join(lines) + "\n")
         else:
             print("\n⚠️  No predictions found in the result")
             
@@ -10,6 +10,7 @@ export interface CaseBrief {
   context_sources: string[];
   generated_at: string;
   privacy_verified: boolean;
+  is_fallback: boolean;
 }
 
 export interface GenerateCaseBriefRequest {
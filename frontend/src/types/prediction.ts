@@ -14,6 +14,7 @@ export interface PredictionResult {
   display_text: string;
   alternative_intents: AlternativeIntent[];
   supporting_visits: string[];
+  is_fallback: boolean;
 }
 
 export interface PredictIntentRequest {
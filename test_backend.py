@@ -5,58 +5,79 @@ Quick test script to verify the backend is working
 
 import requests
 import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 
-def test_backend():
-    """Test backend endpoints"""
-    base_url = "http://localhost:8000"
-    
-    print("🧪 Testing Backend Endpoints...")
-    print("=" * 50)
-    
-    # Test 1: Health Check
+# One keep-alive connection pool shared by all probes
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+BASE_URL = "http://localhost:8000"
+
+# Console banner
+BAR = "=" * 50
+
+def check_health():
+    """Test 1: Health Check"""
+    lines = ["1️⃣ Testing /health endpoint..."]
     try:
-        print("1️⃣ Testing /health endpoint...")
-        response = requests.get(f"{base_url}/health", timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            print(f"   ✅ Health check passed: {data['status']}")
-            print(f"   📊 Features: {data.get('features', {})}")
-        else:
-            print(f"   ❌ Health check failed: {response.status_code}")
+        with SESSION.get(f"{BASE_URL}/health", timeout=10) as response:
+            if response.status_code == 200:
+                data = response.json()
+                lines.append(f"   ✅ Health check passed: {data['status']}")
+                lines.append(f"   📊 Features: {data.get('features', {})}")
+            else:
+                lines.append(f"   ❌ Health check failed: {response.status_code}")
     except Exception as e:
-        print(f"   ❌ Health check error: {e}")
-    
-    print()
-    
-    # Test 2: Models endpoint
+        lines.append(f"   ❌ Health check error: {e}")
+    return lines
+
+def check_models():
+    """Test 2: Models endpoint"""
+    lines = ["2️⃣ Testing /models endpoint..."]
     try:
-        print("2️⃣ Testing /models endpoint...")
-        response = requests.get(f"{base_url}/models", timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            print(f"   ✅ Models endpoint works")
-            print(f"   📊 Available models: {len(data.get('models', []))}")
-        else:
-            print(f"   ❌ Models endpoint failed: {response.status_code}")
+        with SESSION.get(f"{BASE_URL}/models", timeout=10) as response:
+            if response.status_code == 200:
+                data = response.json()
+                lines.append(f"   ✅ Models endpoint works")
+                lines.append(f"   📊 Hybrid detector model: {data.get('hybrid_detector', {}).get('model', 'N/A')}")
+                lines.append(f"   📊 Multi-model lineup: {data.get('model_info', {}).get('total_models', 0)} model(s)")
+            else:
+                lines.append(f"   ❌ Models endpoint failed: {response.status_code}")
     except Exception as e:
-        print(f"   ❌ Models endpoint error: {e}")
-    
-    print()
-    
-    # Test 3: API Documentation
+        lines.append(f"   ❌ Models endpoint error: {e}")
+    return lines
+
+def check_docs():
+    """Test 3: API Documentation"""
+    lines = ["3️⃣ Testing /docs endpoint..."]
     try:
-        print("3️⃣ Testing /docs endpoint...")
-        response = requests.get(f"{base_url}/docs", timeout=10)
-        if response.status_code == 200:
-            print(f"   ✅ API docs accessible")
-            print(f"   🌐 Visit: {base_url}/docs")
-        else:
-            print(f"   ❌ API docs failed: {response.status_code}")
+        with SESSION.get(f"{BASE_URL}/docs", timeout=10) as response:
+            if response.status_code == 200:
+                lines.append(f"   ✅ API docs accessible")
+                lines.append(f"   🌐 Visit: {BASE_URL}/docs")
+            else:
+                lines.append(f"   ❌ API docs failed: {response.status_code}")
     except Exception as e:
-        print(f"   ❌ API docs error: {e}")
+        lines.append(f"   ❌ API docs error: {e}")
+    return lines
+
+def test_backend():
+    """Test backend endpoints"""
+    print("🧪 Testing Backend Endpoints...")
+    print(BAR)
     
-    print()
-    print("=" * 50)
+    # The probes are independent, so run them at the same time
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(probe) for probe in (check_health, check_models, check_docs)]
+        results = [future.result() for future in futures]
+    
+    for lines in results:
+        for line in lines:
+            print(line)
+        print()
+    
+    print(BAR)
     print("🎯 Backend Test Complete!")
     print()
     print("If all tests passed, the backend is ready!")